@@ -0,0 +1,32 @@
+"""versao das linhas para ETag
+
+Revision ID: 3f7b2d9e4a15
+Revises: e1f09b3a6c58
+Create Date: 2026-10-18 16:32:47.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7b2d9e4a15'
+down_revision: Union[str, None] = 'e1f09b3a6c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = ('categoria', 'centros_treinamento', 'atletas')
+
+
+def upgrade() -> None:
+    # Com um default constante o PostgreSQL (11+) só altera o catálogo,
+    # sem reescrever as tabelas.
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for tabela in reversed(TABELAS):
+        op.drop_column(tabela, 'version')
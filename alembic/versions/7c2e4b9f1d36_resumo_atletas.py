@@ -0,0 +1,66 @@
+"""resumo de atletas por categoria, centro e sexo mantido por triggers
+
+Revision ID: 7c2e4b9f1d36
+Revises: 3f7b2d9e4a15
+Create Date: 2026-10-18 18:05:12.430981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from workoutapi.atleta.triggers import FUNCAO, FUNCAO_TRUNCATE, TRIGGERS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4b9f1d36'
+down_revision: Union[str, None] = '3f7b2d9e4a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('atletas_resumo',
+    sa.Column('categoria_id', sa.Integer(), nullable=False),
+    sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+    sa.Column('sexo', sa.String(length=1), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('soma_peso', sa.Float(), nullable=False),
+    sa.Column('soma_altura', sa.Float(), nullable=False),
+    sa.Column('soma_idade', sa.BigInteger(), nullable=False),
+    sa.Column('soma_imc', sa.Float(), nullable=False),
+    sa.Column('imc_abaixo_do_peso', sa.BigInteger(), nullable=False),
+    sa.Column('imc_normal', sa.BigInteger(), nullable=False),
+    sa.Column('imc_sobrepeso', sa.BigInteger(), nullable=False),
+    sa.Column('imc_obesidade', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('categoria_id', 'centro_treinamento_id', 'sexo')
+    )
+    op.execute(FUNCAO)
+    op.execute(FUNCAO_TRUNCATE)
+
+    # Sem escritas em atletas entre a carga inicial e a criação dos triggers,
+    # nenhuma alteração fica de fora do resumo.
+    op.execute('LOCK TABLE atletas IN SHARE MODE')
+    op.execute("""
+        INSERT INTO atletas_resumo
+        SELECT
+            categoria_id, centro_treinamento_id, sexo,
+            count(*), sum(peso), sum(altura), sum(idade), sum(peso / (altura * altura)),
+            count(*) FILTER (WHERE peso / (altura * altura) < 18.5),
+            count(*) FILTER (WHERE peso / (altura * altura) >= 18.5 AND peso / (altura * altura) < 25),
+            count(*) FILTER (WHERE peso / (altura * altura) >= 25 AND peso / (altura * altura) < 30),
+            count(*) FILTER (WHERE peso / (altura * altura) >= 30)
+        FROM atletas
+        GROUP BY categoria_id, centro_treinamento_id, sexo
+    """)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    for trigger in ('atletas_resumo_truncate', 'atletas_resumo_delete', 'atletas_resumo_update', 'atletas_resumo_insert'):
+        op.execute(f'DROP TRIGGER {trigger} ON atletas')
+    op.execute('DROP FUNCTION atletas_resumo_limpar()')
+    op.execute('DROP FUNCTION atletas_resumo_atualizar()')
+    op.drop_table('atletas_resumo')
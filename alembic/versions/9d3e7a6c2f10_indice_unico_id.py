@@ -0,0 +1,33 @@
+"""indice unico em id
+
+Revision ID: 9d3e7a6c2f10
+Revises: 5b2c1f0e8a41
+Create Date: 2026-10-18 11:03:47.118530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3e7a6c2f10'
+down_revision: Union[str, None] = '5b2c1f0e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = ('atletas', 'categoria', 'centros_treinamento')
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação; o
+    # autocommit_block permite aplicar a revisão com o banco em produção.
+    with op.get_context().autocommit_block():
+        for tabela in TABELAS:
+            op.create_index(f'ix_{tabela}_id', tabela, ['id'], unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for tabela in TABELAS:
+            op.drop_index(f'ix_{tabela}_id', table_name=tabela, postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""indices para os filtros de atletas
+
+Revision ID: c4a81e5d7b23
+Revises: 9d3e7a6c2f10
+Create Date: 2026-10-18 14:26:05.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a81e5d7b23'
+down_revision: Union[str, None] = '9d3e7a6c2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # varchar_pattern_ops permite que LIKE 'prefixo%' use o índice em
+        # qualquer collation.
+        op.create_index('ix_atletas_nome_pattern', 'atletas', ['nome'], postgresql_ops={'nome': 'varchar_pattern_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_atletas_categoria_id_pk_id', 'atletas', ['categoria_id', 'pk_id'], postgresql_concurrently=True)
+        op.create_index('ix_atletas_centro_treinamento_id_pk_id', 'atletas', ['centro_treinamento_id', 'pk_id'], postgresql_concurrently=True)
+        op.create_index('ix_atletas_idade', 'atletas', ['idade'], postgresql_concurrently=True)
+        op.create_index('ix_atletas_created_at', 'atletas', ['created_at'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_atletas_created_at', table_name='atletas', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_idade', table_name='atletas', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_centro_treinamento_id_pk_id', table_name='atletas', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_categoria_id_pk_id', table_name='atletas', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_nome_pattern', table_name='atletas', postgresql_concurrently=True)
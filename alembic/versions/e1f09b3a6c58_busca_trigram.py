@@ -0,0 +1,32 @@
+"""busca por trigramas em nomes de atletas e centros
+
+Revision ID: e1f09b3a6c58
+Revises: c4a81e5d7b23
+Create Date: 2026-10-18 15:48:19.264107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f09b3a6c58'
+down_revision: Union[str, None] = 'c4a81e5d7b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_atletas_nome_trgm', 'atletas', ['nome'], postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_centros_treinamento_nome_trgm', 'centros_treinamento', ['nome'], postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    # A extensão pg_trgm fica instalada: pode estar em uso fora desta aplicação.
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_centros_treinamento_nome_trgm', table_name='centros_treinamento', postgresql_concurrently=True)
+        op.drop_index('ix_atletas_nome_trgm', table_name='atletas', postgresql_concurrently=True)
@@ -0,0 +1,90 @@
+"""Latência da busca por id (UUID) com e sem o índice único, por tamanho de tabela.
+
+Cria uma tabela temporária com o mesmo formato de chave das tabelas da API,
+mede SELECT ... WHERE id = :id antes e depois de criar o índice e imprime
+p50/p95 em milissegundos. Usa o banco configurado em DB_URL.
+
+    python -m benchmarks.by_id_lookup --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from workoutapi.configs.settings import settings
+
+
+def _percentil(amostras: list[float], p: float) -> float:
+    return statistics.quantiles(amostras, n=100, method='inclusive')[int(p) - 1]
+
+
+async def _medir(conn: AsyncConnection, ids: list, lookups: int) -> list[float]:
+    consulta = text('SELECT pk_id, id, nome FROM bench_by_id WHERE id = :id')
+
+    amostras = []
+    for _ in range(lookups):
+        inicio = time.perf_counter()
+        (await conn.execute(consulta, {'id': random.choice(ids)})).first()
+        amostras.append((time.perf_counter() - inicio) * 1000)
+
+    return amostras
+
+
+async def _rodar(tamanho: int, lookups: int) -> dict:
+    engine = create_async_engine(settings.DB_URL)
+
+    async with engine.connect() as conn:
+        await conn.execute(text(
+            'CREATE TEMP TABLE bench_by_id (pk_id serial PRIMARY KEY, id uuid NOT NULL, nome varchar(50) NOT NULL)'
+        ))
+        await conn.execute(text(
+            "INSERT INTO bench_by_id (id, nome) "
+            "SELECT md5(random()::text || i::text)::uuid, 'atleta ' || i FROM generate_series(1, :n) AS i"
+        ), {'n': tamanho})
+        await conn.execute(text('ANALYZE bench_by_id'))
+
+        ids = (await conn.execute(
+            text('SELECT id FROM bench_by_id ORDER BY random() LIMIT 1000')
+        )).scalars().all()
+
+        sem_indice = await _medir(conn, ids, lookups)
+
+        await conn.execute(text('CREATE UNIQUE INDEX ix_bench_by_id_id ON bench_by_id (id)'))
+        await conn.execute(text('ANALYZE bench_by_id'))
+
+        com_indice = await _medir(conn, ids, lookups)
+
+        await conn.rollback()
+
+    await engine.dispose()
+
+    return {
+        'tamanho': tamanho,
+        'sem_indice_p50': _percentil(sem_indice, 50),
+        'sem_indice_p95': _percentil(sem_indice, 95),
+        'com_indice_p50': _percentil(com_indice, 50),
+        'com_indice_p95': _percentil(com_indice, 95),
+    }
+
+
+async def main(sizes: list[int], lookups: int) -> None:
+    print(f"{'linhas':>10} | {'sem índice p50':>14} {'p95':>9} | {'com índice p50':>14} {'p95':>9}  (ms)")
+    for tamanho in sizes:
+        r = await _rodar(tamanho, lookups)
+        print(
+            f"{r['tamanho']:>10} | {r['sem_indice_p50']:>14.3f} {r['sem_indice_p95']:>9.3f} | "
+            f"{r['com_indice_p50']:>14.3f} {r['com_indice_p95']:>9.3f}"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--lookups', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.lookups))
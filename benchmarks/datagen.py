@@ -0,0 +1,264 @@
+"""Gera categorias, centros e atletas sintéticos e carrega com COPY.
+
+Cada lote sai de um random.Random derivado da seed e da posição do lote, então
+a mesma seed, os mesmos volumes e o mesmo --lote produzem sempre o mesmo
+banco, com qualquer número de --workers. CPFs têm dígitos
+verificadores válidos e são únicos; peso e altura seguem normais por sexo;
+a idade é triangular em torno de 28 anos; categorias e centros recebem
+atletas com distribuição de Zipf (--skew), como na produção, onde poucos
+centros concentram a maioria. APAGA os dados existentes (TRUNCATE) no banco
+de DB_URL; rode `make run-migrations` antes.
+
+    python -m benchmarks.datagen --atletas 2000000 --centros 500 --seed 42
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import os
+import random
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from workoutapi.atleta.models import AtletaModel
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+from workoutapi.configs.settings import settings
+
+NOMES_F = (
+    'Ana', 'Maria', 'Juliana', 'Fernanda', 'Camila', 'Beatriz', 'Larissa', 'Patrícia', 'Aline', 'Bruna',
+    'Gabriela', 'Letícia', 'Mariana', 'Natália', 'Paula', 'Renata', 'Tatiane', 'Vanessa', 'Carla', 'Débora',
+)
+NOMES_M = (
+    'João', 'José', 'Pedro', 'Lucas', 'Gabriel', 'Rafael', 'Bruno', 'Felipe', 'Gustavo', 'Thiago',
+    'Mateus', 'Leonardo', 'Rodrigo', 'Marcos', 'Daniel', 'Eduardo', 'Diego', 'André', 'Vinícius', 'Carlos',
+)
+SOBRENOMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+)
+CATEGORIAS = ('Scale', 'RX', 'Elite', 'Iniciante', 'Teen', 'Master 35', 'Master 40', 'Master 45', 'Master 50', 'Adaptado')
+CIDADES = ('Recife', 'Salvador', 'Natal', 'Fortaleza', 'Manaus', 'Belém', 'Goiânia', 'Curitiba', 'Vitória', 'Maceió')
+
+# Multiplicador inverso módulo 10^9: espalha i = 0, 1, 2... por todo o espaço
+# de CPFs sem repetir (é uma bijeção, 7 e 10^9 são coprimos).
+_CPF_MULTIPLICADOR = 7 ** 11
+_CPF_BASES = 10 ** 9
+_UUID_MASCARA = ~((0xF << 76) | (0x3 << 62)) & ((1 << 128) - 1)
+_UUID_V4 = (0x4 << 76) | (0x2 << 62)
+_INICIO = datetime(2021, 1, 1)
+_PERIODO = int(timedelta(days=3 * 365).total_seconds())
+_COLUNAS_ATLETAS = (
+    'pk_id', 'id', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo', 'created_at',
+    'categoria_id', 'centro_treinamento_id', 'version',
+)
+
+
+def cpf(i: int) -> str:
+    base = f'{(i * _CPF_MULTIPLICADOR + 123_456_789) % _CPF_BASES:09d}'
+    d = [ord(c) - 48 for c in base]
+    dv1 = (10 * d[0] + 9 * d[1] + 8 * d[2] + 7 * d[3] + 6 * d[4] + 5 * d[5] + 4 * d[6] + 3 * d[7] + 2 * d[8]) * 10 % 11 % 10
+    dv2 = (11 * d[0] + 10 * d[1] + 9 * d[2] + 8 * d[3] + 7 * d[4] + 6 * d[5] + 5 * d[6] + 4 * d[7] + 3 * d[8] + 2 * dv1) * 10 % 11 % 10
+    return f'{base}{dv1}{dv2}'
+
+
+def _pesos_zipf(quantidade: int, skew: float) -> list[float]:
+    return list(itertools.accumulate(1 / (posicao ** skew) for posicao in range(1, quantidade + 1)))
+
+
+def _uuid4(bits: int) -> str:
+    h = f'{(bits & _UUID_MASCARA) | _UUID_V4:032x}'
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+def categorias(quantidade: int, rng: random.Random) -> list[tuple]:
+    nomes = CATEGORIAS[:quantidade] + tuple(f'Cat {i}' for i in range(len(CATEGORIAS) + 1, quantidade + 1))
+    return [(pk_id, uuid.UUID(_uuid4(rng.getrandbits(128))), nome) for pk_id, nome in enumerate(nomes, start=1)]
+
+
+def centros(quantidade: int, rng: random.Random) -> list[tuple]:
+    return [
+        (
+            pk_id, uuid.UUID(_uuid4(rng.getrandbits(128))), f'CT {CIDADES[pk_id % len(CIDADES)]} {pk_id}',
+            f'Rua {rng.choice(SOBRENOMES)}, {rng.randint(1, 2000)}',
+            f'{rng.choice(NOMES_M + NOMES_F)} {rng.choice(SOBRENOMES)}',
+        )
+        for pk_id in range(1, quantidade + 1)
+    ]
+
+
+def lote_atletas(
+    seed: int,
+    inicio: int,
+    quantidade: int,
+    total_categorias: int,
+    total_centros: int,
+    skew: float,
+) -> bytes:
+    # Um gerador por lote, derivado da seed e do início do lote: o resultado
+    # não depende da ordem nem do processo em que os lotes são gerados.
+    rng = random.Random(f'{seed}:{inicio}')
+    getrandbits, gauss, random_, triangular = rng.getrandbits, rng.gauss, rng.random, rng.triangular
+
+    sexos = rng.choices('MF', weights=(55, 45), k=quantidade)
+    categorias_lote = rng.choices(range(1, total_categorias + 1), cum_weights=_pesos_zipf(total_categorias, skew), k=quantidade)
+    centros_lote = rng.choices(range(1, total_centros + 1), cum_weights=_pesos_zipf(total_centros, skew), k=quantidade)
+
+    linhas = []
+    for i, sexo, categoria_id, centro_id in zip(range(inicio, inicio + quantidade), sexos, categorias_lote, centros_lote):
+        if sexo == 'M':
+            nomes, peso, altura = NOMES_M, gauss(78, 12), gauss(1.75, 0.07)
+        else:
+            nomes, peso, altura = NOMES_F, gauss(64, 10), gauss(1.62, 0.065)
+
+        nome = f'{nomes[int(random_() * len(nomes))]} {SOBRENOMES[int(random_() * len(SOBRENOMES))]}'
+        created_at = _INICIO + timedelta(seconds=int(random_() * _PERIODO))
+        linhas.append(
+            f'{i + 1},{_uuid4(getrandbits(128))},{nome},{cpf(i)},{int(triangular(16, 65, 28))},'
+            f'{min(max(peso, 40.0), 160.0):.1f},{min(max(altura, 1.40), 2.10):.2f},{sexo},{created_at},'
+            f'{categoria_id},{centro_id},1\n'
+        )
+
+    return ''.join(linhas).encode()
+
+
+async def _copy_registros(engine: AsyncEngine, tabela: str, colunas: tuple[str, ...], registros: list[tuple]) -> None:
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.copy_records_to_table(tabela, records=registros, columns=colunas)
+        await conn.commit()
+
+
+async def _copy_atletas(engine: AsyncEngine, lotes: AsyncIterator[bytes]) -> None:
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        async for dados in lotes:
+            await raw.copy_to_table(AtletaModel.__tablename__, source=io.BytesIO(dados), columns=_COLUNAS_ATLETAS, format='csv')
+        await conn.commit()
+
+
+async def _gerar_lotes(
+    total_atletas: int,
+    total_categorias: int,
+    total_centros: int,
+    seed: int,
+    skew: float,
+    lote: int,
+    workers: int,
+) -> AsyncIterator[bytes]:
+    # Os lotes são gerados em processos separados enquanto o anterior é
+    # enviado por COPY; no máximo 2 por worker ficam em memória.
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes: deque = deque()
+        for inicio in range(0, total_atletas, lote):
+            pendentes.append(loop.run_in_executor(
+                pool, lote_atletas, seed, inicio, min(lote, total_atletas - inicio), total_categorias, total_centros, skew
+            ))
+            if len(pendentes) >= 2 * workers:
+                yield await pendentes.popleft()
+
+        while pendentes:
+            yield await pendentes.popleft()
+
+
+async def _indices_secundarios(engine: AsyncEngine, tabela: str) -> list[tuple[str, str]]:
+    # Índices que não sustentam constraints (PK, UNIQUE do cpf) podem ser
+    # removidos durante a carga e recriados depois com o mesmo DDL.
+    async with engine.connect() as conn:
+        return [tuple(row) for row in await conn.execute(text(
+            "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "WHERE i.indrelid = CAST(:tabela AS regclass) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)"
+        ), {'tabela': tabela})]
+
+
+async def gerar(
+    engine: AsyncEngine,
+    total_atletas: int,
+    total_categorias: int,
+    total_centros: int,
+    seed: int = 42,
+    skew: float = 1.1,
+    lote: int = 50_000,
+    workers: int = os.cpu_count() or 1,
+    recriar_indices: bool = True,
+) -> dict:
+    rng = random.Random(seed)
+    tabelas = (AtletaModel.__tablename__, CentroTreinamentoModel.__tablename__, CategoriaModel.__tablename__)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {', '.join(tabelas)} RESTART IDENTITY CASCADE"))
+
+    inicio = time.perf_counter()
+    await _copy_registros(engine, CategoriaModel.__tablename__, ('pk_id', 'id', 'nome'), categorias(total_categorias, rng))
+    await _copy_registros(
+        engine, CentroTreinamentoModel.__tablename__, ('pk_id', 'id', 'nome', 'endereco', 'proprietario'),
+        centros(total_centros, rng),
+    )
+
+    # Manter os índices durante o COPY custa uma inserção em cada um por
+    # linha; criá-los no fim, de uma vez, é bem mais rápido.
+    indices = await _indices_secundarios(engine, AtletaModel.__tablename__) if recriar_indices else []
+    async with engine.begin() as conn:
+        for nome, _ in indices:
+            await conn.execute(text(f'DROP INDEX {nome}'))
+    try:
+        await _copy_atletas(engine, _gerar_lotes(total_atletas, total_categorias, total_centros, seed, skew, lote, workers))
+    finally:
+        async with engine.begin() as conn:
+            for _, ddl in indices:
+                await conn.execute(text(ddl))
+    duracao = time.perf_counter() - inicio
+
+    # pk_id foi informado no COPY: as sequences precisam continuar depois dele.
+    async with engine.begin() as conn:
+        for tabela in tabelas:
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{tabela}', 'pk_id'), "
+                f"(SELECT coalesce(max(pk_id), 0) + 1 FROM {tabela}), false)"
+            ))
+        await conn.execute(text(f"ANALYZE {', '.join(tabelas)}"))
+
+    return {'atletas': total_atletas, 'segundos': duracao, 'linhas_por_segundo': total_atletas / duracao if duracao else 0}
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(settings.DB_URL)
+    try:
+        resultado = await gerar(
+            engine, args.atletas, args.categorias, args.centros, args.seed, args.skew, args.lote, args.workers,
+            recriar_indices=not args.manter_indices,
+        )
+    finally:
+        await engine.dispose()
+
+    print(
+        f"{resultado['atletas']} atletas em {resultado['segundos']:.1f}s "
+        f"({resultado['linhas_por_segundo']:,.0f} linhas/s), seed {args.seed}"
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--atletas', type=int, default=1_000_000)
+    parser.add_argument('--categorias', type=int, default=len(CATEGORIAS))
+    parser.add_argument('--centros', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skew', type=float, default=1.1, help='Expoente de Zipf para categoria e centro de cada atleta')
+    parser.add_argument('--lote', type=int, default=50_000, help='Atletas gerados e enviados por COPY de cada vez')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos gerando lotes')
+    parser.add_argument(
+        '--manter-indices', action='store_true', help='Não remove os índices secundários de atletas durante o COPY'
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
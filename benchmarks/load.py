@@ -0,0 +1,259 @@
+"""Carga em todas as rotas da API, em processo, contra um PostgreSQL local.
+
+Popula o banco de DB_URL com benchmarks.datagen, em volumes configuráveis de
+categorias, centros e atletas (APAGA os dados existentes; rode
+`make run-migrations` antes), envia
+as requisições de cada cenário por um httpx.AsyncClient com ASGITransport na
+concorrência pedida e imprime p50/p95/p99, vazão e statements por requisição
+(lidos do header X-DB-Statements). Com --output grava o resultado em JSON
+para comparar execuções entre commits.
+
+    python -m benchmarks.load --atletas 100000 --requests 500 --concurrency 20 --output atual.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+
+from benchmarks import datagen
+from workoutapi.configs.database import engine
+from workoutapi.main import app
+from workoutapi.routers import api_router
+
+Requisicao = tuple[str, str, dict]
+
+
+@dataclass
+class Cenario:
+    nome: str
+    rota: str
+    requisicao: Callable[[int], Requisicao]
+    esperado: tuple[int, ...] = (200,)
+
+
+@dataclass
+class Dados:
+    categorias: int
+    centros: int
+    atletas: int
+    atleta_ids: list[str]
+    atleta_cpfs: list[str]
+    categoria_ids: list[str]
+    categoria_nomes: list[str]
+    centro_ids: list[str]
+    centro_nomes: list[str]
+
+
+async def carregar_dados() -> Dados:
+    async with engine.connect() as conn:
+        categorias = (await conn.execute(text('SELECT id, nome FROM categoria ORDER BY pk_id'))).all()
+        centros = (await conn.execute(text('SELECT id, nome FROM centros_treinamento ORDER BY pk_id'))).all()
+        atletas = (await conn.execute(text('SELECT id, cpf FROM atletas ORDER BY pk_id'))).all()
+
+    return Dados(
+        len(categorias), len(centros), len(atletas),
+        [str(id) for id, _ in atletas], [cpf for _, cpf in atletas],
+        [str(id) for id, _ in categorias], [nome for _, nome in categorias],
+        [str(id) for id, _ in centros], [nome for _, nome in centros],
+    )
+
+
+def cenarios(dados: Dados, requests: int, seed: int) -> list[Cenario]:
+    aleatorio = random.Random(seed)
+    execucao = int(time.time())
+
+    def atleta_novo(i: int, lote: int = 0) -> dict:
+        return {
+            'nome': f'Bench {i}', 'cpf': f'9{execucao % 10_000:04d}{lote:02d}{i % 10_000:04d}', 'idade': 30,
+            'peso': 80.5, 'altura': 1.8, 'sexo': 'M',
+            'categoria': {'nome': dados.categoria_nomes[0]}, 'centro_treinamento': {'nome': dados.centro_nomes[0]},
+        }
+
+    def nome() -> str:
+        return f'{aleatorio.choice(datagen.NOMES_F + datagen.NOMES_M)} {aleatorio.choice(datagen.SOBRENOMES)}'
+
+    def cpf() -> str:
+        # Metade dos CPFs existe; a outra metade exercita o cache negativo.
+        if aleatorio.random() < 0.5:
+            return aleatorio.choice(dados.atleta_cpfs)
+        return datagen.cpf(dados.atletas + aleatorio.randint(0, dados.atletas))
+
+    # DELETE usa ids do fim da tabela, um por requisição (popule ao menos
+    # --requests atletas); PATCH usa o começo.
+    removiveis = dados.atleta_ids[-requests:] or ['00000000-0000-4000-8000-000000000000']
+    paginas = max(dados.atletas // 10, 1)
+
+    return [
+        Cenario('atletas_cursor', 'GET /atletas/', lambda i: ('GET', '/atletas/', {})),
+        Cenario('atletas_offset', 'GET /atletas/',
+                lambda i: ('GET', '/atletas/', {'params': {'page': aleatorio.randint(1, paginas)}})),
+        Cenario('atletas_filtro_nome', 'GET /atletas/',
+                lambda i: ('GET', '/atletas/', {'params': {'nome': nome()}})),
+        Cenario('atletas_search', 'GET /atletas/search',
+                lambda i: ('GET', '/atletas/search', {'params': {'q': aleatorio.choice(datagen.SOBRENOMES)}})),
+        Cenario('atletas_stats', 'GET /atletas/stats',
+                lambda i: ('GET', '/atletas/stats', {'params': {
+                    'group_by': ('categoria', 'centro_treinamento', 'sexo')[i % 3],
+                }})),
+        Cenario('atletas_export', 'GET /atletas/export',
+                lambda i: ('GET', '/atletas/export', {'params': {'categoria': dados.categoria_nomes[-1]}})),
+        Cenario('atletas_by_id', 'GET /atletas/{id}',
+                lambda i: ('GET', f'/atletas/{aleatorio.choice(dados.atleta_ids)}', {})),
+        Cenario('atletas_by_cpf', 'GET /atletas/by-cpf/{cpf}',
+                lambda i: ('GET', f'/atletas/by-cpf/{cpf()}', {}),
+                esperado=(200, 404)),
+        Cenario('atletas_post', 'POST /atletas/',
+                lambda i: ('POST', '/atletas/', {'json': atleta_novo(i)}), esperado=(201,)),
+        Cenario('atletas_bulk', 'POST /atletas/bulk',
+                lambda i: ('POST', '/atletas/bulk', {'json': [atleta_novo(i, lote) for lote in range(1, 11)]})),
+        Cenario('atletas_patch', 'PATCH /atletas/{id}',
+                lambda i: ('PATCH', f'/atletas/{dados.atleta_ids[i % len(dados.atleta_ids)]}',
+                           {'json': {'idade': aleatorio.randint(18, 60)}})),
+        Cenario('atletas_delete', 'DELETE /atletas/{id}',
+                lambda i: ('DELETE', f'/atletas/{removiveis[i % len(removiveis)]}', {}), esperado=(204,)),
+        Cenario('categorias_lista', 'GET /categorias/', lambda i: ('GET', '/categorias/', {'params': {'page': 1}})),
+        Cenario('categorias_by_id', 'GET /categorias/{id}',
+                lambda i: ('GET', f'/categorias/{aleatorio.choice(dados.categoria_ids)}', {})),
+        Cenario('categorias_post', 'POST /categorias/',
+                lambda i: ('POST', '/categorias/', {'params': {'on_conflict': 'ignore'},
+                                                    'json': {'nome': aleatorio.choice(dados.categoria_nomes)}})),
+        Cenario('centros_lista', 'GET /centros_treinamento/',
+                lambda i: ('GET', '/centros_treinamento/', {'params': {'page': 1}})),
+        Cenario('centros_by_id', 'GET /centros_treinamento/{id}',
+                lambda i: ('GET', f'/centros_treinamento/{aleatorio.choice(dados.centro_ids)}', {})),
+        Cenario('centros_post', 'POST /centros_treinamento/',
+                lambda i: ('POST', '/centros_treinamento/', {'params': {'on_conflict': 'update'}, 'json': {
+                    'nome': aleatorio.choice(dados.centro_nomes), 'endereco': f'Rua {i}', 'proprietario': 'Bench',
+                }})),
+    ]
+
+
+def rotas_sem_cenario(lista: list[Cenario]) -> list[str]:
+    cobertas = {cenario.rota for cenario in lista}
+    return sorted(
+        f'{metodo} {rota.path}'
+        for rota in api_router.routes if isinstance(rota, APIRoute)
+        for metodo in rota.methods
+        if f'{metodo} {rota.path}' not in cobertas
+    )
+
+
+def _percentil(amostras: list[float], p: int) -> float:
+    if len(amostras) < 2:
+        return amostras[0] if amostras else 0.0
+    return statistics.quantiles(amostras, n=100, method='inclusive')[p - 1]
+
+
+async def rodar(client: httpx.AsyncClient, cenario: Cenario, requests: int, concurrency: int) -> dict:
+    latencias: list[float] = []
+    statements: list[int] = []
+    erros: dict[str, int] = {}
+    proxima = iter(range(requests))
+
+    async def worker() -> None:
+        for i in proxima:
+            metodo, url, kwargs = cenario.requisicao(i)
+            inicio = time.perf_counter()
+            response = await client.request(metodo, url, **kwargs)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            statements.append(int(response.headers.get('x-db-statements', 0)))
+            if response.status_code not in cenario.esperado:
+                erros[str(response.status_code)] = erros.get(str(response.status_code), 0) + 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duracao = time.perf_counter() - inicio
+
+    return {
+        'cenario': cenario.nome,
+        'rota': cenario.rota,
+        'requests': requests,
+        'p50_ms': _percentil(latencias, 50),
+        'p95_ms': _percentil(latencias, 95),
+        'p99_ms': _percentil(latencias, 99),
+        'throughput_rps': requests / duracao,
+        'statements_por_request': statistics.fmean(statements),
+        'erros': erros,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> None:
+    if not args.skip_seed:
+        await datagen.gerar(engine, args.atletas, args.categorias, args.centros, args.seed)
+    dados = await carregar_dados()
+
+    lista = [cenario for cenario in cenarios(dados, args.requests, args.seed)
+             if not args.scenarios or cenario.nome in args.scenarios]
+    sem_cenario = rotas_sem_cenario(cenarios(dados, args.requests, args.seed))
+    if sem_cenario:
+        print(f"Rotas sem cenário: {', '.join(sem_cenario)}")
+
+    resultados = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+        for cenario in lista:
+            for i in range(min(args.warmup, args.requests)):
+                metodo, url, kwargs = cenario.requisicao(i)
+                if metodo == 'GET':
+                    await client.request(metodo, url, **kwargs)
+            resultados.append(await rodar(client, cenario, args.requests, args.concurrency))
+
+    await engine.dispose()
+
+    print(f'{dados.atletas} atletas, {args.requests} requisições por cenário, concorrência {args.concurrency}')
+    print(f"{'cenário':<22} | {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} | {'req/s':>8} | {'stmts':>5} | erros")
+    for r in resultados:
+        print(
+            f"{r['cenario']:<22} | {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} | "
+            f"{r['throughput_rps']:>8.1f} | {r['statements_por_request']:>5.2f} | {r['erros'] or ''}"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as arquivo:
+            json.dump({
+                'commit': _commit(),
+                'data': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'parametros': {
+                    'categorias': dados.categorias, 'centros': dados.centros, 'atletas': dados.atletas,
+                    'requests': args.requests, 'concurrency': args.concurrency, 'seed': args.seed,
+                },
+                'resultados': resultados,
+            }, arquivo, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--categorias', type=int, default=10)
+    parser.add_argument('--centros', type=int, default=100)
+    parser.add_argument('--atletas', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=200, help='Requisições por cenário')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=10, help='GETs descartados antes de medir cada cenário')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scenarios', nargs='+', help='Roda só estes cenários')
+    parser.add_argument('--skip-seed', action='store_true', help='Usa os dados que já estão no banco')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado')
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
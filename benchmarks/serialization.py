@@ -0,0 +1,96 @@
+"""Custo de serializar uma página de atletas, do handler até os bytes da resposta.
+
+Compara, para a mesma página, o caminho antigo (model_validate por objeto,
+response_model revalidado pelo FastAPI e JSONResponse com json da stdlib),
+só a troca para ORJSONResponse, e o caminho atual (TypeAdapter em cache e
+model_dump_json devolvido direto). Não precisa de banco.
+
+    python -m benchmarks.serialization --items 1000 --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from workoutapi.atleta.schemas import AtletaOut
+from workoutapi.contrib.pagination import CursorPage
+from workoutapi.contrib.responses import json_response, list_adapter
+
+
+def _linhas(quantidade: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            created_at=datetime.utcnow(),
+            nome=f'Atleta {i}',
+            cpf=f'{i:011d}',
+            idade=20 + i % 30,
+            peso=60 + i % 40 + 0.5,
+            altura=1.60 + (i % 40) / 100,
+            sexo='M' if i % 2 else 'F',
+            categoria=SimpleNamespace(nome='Scale'),
+            centro_treinamento=SimpleNamespace(nome='CT King'),
+        )
+        for i in range(quantidade)
+    ]
+
+
+def _app(linhas: list[SimpleNamespace]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/stdlib', response_model=CursorPage[AtletaOut], response_class=JSONResponse)
+    async def stdlib():
+        return CursorPage[AtletaOut](items=[AtletaOut.model_validate(linha) for linha in linhas], size=len(linhas))
+
+    @app.get('/orjson', response_model=CursorPage[AtletaOut], response_class=ORJSONResponse)
+    async def orjson():
+        return CursorPage[AtletaOut](items=[AtletaOut.model_validate(linha) for linha in linhas], size=len(linhas))
+
+    @app.get('/adapter', response_model=CursorPage[AtletaOut])
+    async def adapter():
+        items = list_adapter(AtletaOut).validate_python(linhas, from_attributes=True)
+        return json_response(CursorPage[AtletaOut](items=items, size=len(linhas)))
+
+    return app
+
+
+async def main(items: int, requests: int) -> None:
+    app = _app(_linhas(items))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        resultados = {}
+        for rota in ('/stdlib', '/orjson', '/adapter'):
+            for _ in range(10):
+                await client.get(rota)
+
+            amostras = []
+            for _ in range(requests):
+                inicio = time.perf_counter()
+                response = await client.get(rota)
+                amostras.append((time.perf_counter() - inicio) * 1000)
+                response.raise_for_status()
+            resultados[rota] = amostras
+
+    base = statistics.median(resultados['/stdlib'])
+    print(f'{items} atletas por página, {requests} requisições por caminho')
+    print(f"{'caminho':>10} | {'p50 ms':>8} {'p95 ms':>8} | {'vs stdlib':>9}")
+    for rota, amostras in resultados.items():
+        p50 = statistics.median(amostras)
+        p95 = statistics.quantiles(amostras, n=20)[-1]
+        print(f'{rota:>10} | {p50:>8.2f} {p95:>8.2f} | {base / p50:>8.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.items, args.requests))
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+# Os testes com banco apagam e recriam as tabelas: só rodam contra um banco
+# próprio, informado em TEST_DB_URL, que substitui DB_URL antes de a
+# aplicação ser importada.
+TEST_DB_URL = os.environ.get('TEST_DB_URL')
+if TEST_DB_URL:
+    os.environ['DB_URL'] = TEST_DB_URL
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+def _pg_trgm_instalado(ddl, target, bind, **kw) -> bool:
+    from sqlalchemy import text
+
+    return bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
+
+@pytest.fixture
+async def client():
+    if not TEST_DB_URL:
+        pytest.skip('defina TEST_DB_URL para rodar os testes com banco')
+
+    import httpx
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    from workoutapi.atleta.cache import atletas_por_cpf
+    from workoutapi.configs.database import engine
+    from workoutapi.contrib.idempotency import respostas
+    from workoutapi.contrib.lookups import categoria_ids, centro_treinamento_ids
+    from workoutapi.contrib.models import BaseModel
+    from workoutapi.contrib.response_cache import response_cache
+    from workoutapi.main import app
+
+    async with engine.connect() as conn:
+        try:
+            await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            await conn.commit()
+        except DBAPIError:
+            await conn.rollback()
+
+    # Sem pg_trgm os índices GIN da busca ficam de fora; nenhum teste usa
+    # /atletas/search.
+    for tabela in BaseModel.metadata.sorted_tables:
+        for indice in tabela.indexes:
+            if 'gin_trgm_ops' in indice.dialect_options['postgresql']['ops'].values():
+                indice.ddl_if(callable_=_pg_trgm_instalado)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.drop_all)
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    for cache in (atletas_por_cpf, categoria_ids, centro_treinamento_ids, respostas):
+        cache.invalidate()
+    for namespace in ('categorias', 'centros_treinamento'):
+        await response_cache.invalidate(namespace)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        yield client
+
+    await engine.dispose()
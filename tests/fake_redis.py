@@ -0,0 +1,56 @@
+from typing import Callable, Optional
+
+
+class FakeRedis:
+    # Subconjunto de redis.asyncio.Redis usado pelo RedisBackend: contadores e
+    # hashes com expiração da chave inteira. Valores voltam como bytes, como
+    # no cliente real sem decode_responses.
+    def __init__(self, relogio: Callable[[], float]):
+        self.relogio = relogio
+        self._valores: dict[str, bytes] = {}
+        self._hashes: dict[str, dict[str, bytes]] = {}
+        self._expira_em: dict[str, float] = {}
+
+    def _hash(self, name: str) -> Optional[dict[str, bytes]]:
+        expira_em = self._expira_em.get(name)
+        if expira_em is not None and expira_em <= self.relogio():
+            self._hashes.pop(name, None)
+            self._expira_em.pop(name, None)
+        return self._hashes.get(name)
+
+    async def get(self, name: str) -> Optional[bytes]:
+        return self._valores.get(name)
+
+    async def incr(self, name: str) -> int:
+        valor = int(self._valores.get(name, b'0')) + 1
+        self._valores[name] = str(valor).encode()
+        return valor
+
+    async def hget(self, name: str, key: str) -> Optional[bytes]:
+        valores = self._hash(name)
+        return None if valores is None else valores.get(key)
+
+    async def hset(self, name: str, key: str, value) -> int:
+        valores = self._hash(name)
+        if valores is None:
+            valores = self._hashes[name] = {}
+
+        novo = key not in valores
+        valores[key] = value if isinstance(value, bytes) else str(value).encode()
+        return int(novo)
+
+    async def expire(self, name: str, time: int, nx: bool = False) -> bool:
+        if self._hash(name) is None or (nx and name in self._expira_em):
+            return False
+
+        self._expira_em[name] = self.relogio() + time
+        return True
+
+    async def delete(self, *names: str) -> int:
+        removidas = 0
+        for name in names:
+            if self._hash(name) is not None:
+                del self._hashes[name]
+                self._expira_em.pop(name, None)
+                removidas += 1
+        return removidas
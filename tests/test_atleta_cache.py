@@ -0,0 +1,22 @@
+from workoutapi.atleta.cache import NAO_ENCONTRADO, atletas_por_cpf, geracao_cpfs, get_atleta, invalidate_cpfs, set_atleta
+
+
+def setup_function():
+    atletas_por_cpf.invalidate()
+
+
+def test_ausencia_fica_em_cache():
+    geracao = geracao_cpfs()
+    set_atleta('12345678900', None, geracao)
+
+    assert get_atleta('12345678900') is NAO_ENCONTRADO
+
+
+def test_ausencia_lida_antes_da_invalidacao_nao_vai_para_o_cache():
+    # A consulta leu "não encontrado"; o POST do mesmo cpf faz commit e
+    # invalida antes de a consulta gravar o resultado.
+    geracao = geracao_cpfs()
+    invalidate_cpfs(['12345678900'])
+    set_atleta('12345678900', None, geracao)
+
+    assert get_atleta('12345678900') is None
@@ -0,0 +1,22 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+CHAVE = {'Idempotency-Key': 'categoria-scale'}
+
+
+async def test_retentativa_identica_devolve_a_resposta_guardada(client):
+    primeira = await client.post('/categorias/?on_conflict=ignore', json={'nome': 'Scale'}, headers=CHAVE)
+    retentativa = await client.post('/categorias/?on_conflict=ignore', json={'nome': 'Scale'}, headers=CHAVE)
+
+    assert primeira.status_code == retentativa.status_code == 201
+    assert retentativa.headers['Idempotent-Replayed'] == 'true'
+    assert retentativa.json() == primeira.json()
+
+
+async def test_mesma_chave_com_outra_query_string_e_conflito(client):
+    await client.post('/categorias/?on_conflict=ignore', json={'nome': 'Scale'}, headers=CHAVE)
+    outra = await client.post('/categorias/?on_conflict=update', json={'nome': 'Scale'}, headers=CHAVE)
+
+    assert outra.status_code == 422
+    assert 'Idempotent-Replayed' not in outra.headers
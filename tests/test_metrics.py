@@ -0,0 +1,33 @@
+import httpx
+import pytest
+
+from workoutapi.contrib.middleware import http_responses
+from workoutapi.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client():
+    # Nenhuma destas rotas consulta o banco.
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+        yield client
+
+
+@pytest.mark.parametrize('path', ['/openapi.json', '/docs'])
+async def test_rotas_starlette_usam_o_proprio_path(client, path):
+    antes = http_responses.value(method='GET', route=path, status='200')
+
+    response = await client.get(path)
+
+    assert response.status_code == 200
+    assert http_responses.value(method='GET', route=path, status='200') == antes + 1
+
+
+async def test_404_fica_como_unmatched(client):
+    antes = http_responses.value(method='GET', route='unmatched', status='404')
+
+    response = await client.get('/nao-existe')
+
+    assert response.status_code == 404
+    assert http_responses.value(method='GET', route='unmatched', status='404') == antes + 1
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tests.fake_redis import FakeRedis
+from workoutapi.contrib import cache
+from workoutapi.contrib.response_cache import MemoryBackend, RedisBackend, ResponseCache, response_cache_lookups
+
+pytestmark = pytest.mark.anyio
+
+TTL = 60
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+    def avancar(self, segundos: float) -> None:
+        self.agora += segundos
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(monotonic=relogio))
+    return relogio
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request, relogio):
+    if request.param == 'redis':
+        return RedisBackend(FakeRedis(relogio), TTL)
+    return MemoryBackend(TTL, maxsize=10)
+
+
+async def valor(backend, namespace: str, key: str):
+    value, _ = await backend.get(namespace, key)
+    return value
+
+
+async def guardar(backend, namespace: str, key: str, value: bytes) -> None:
+    _, geracao = await backend.get(namespace, key)
+    await backend.set(namespace, key, value, geracao)
+
+
+async def test_miss_devolve_none(backend):
+    assert await valor(backend, 'categorias', '/categorias/?') is None
+
+
+async def test_hit_devolve_os_bytes_guardados(backend):
+    await guardar(backend, 'categorias', '/categorias/?', b'{"items":[]}')
+
+    assert await valor(backend, 'categorias', '/categorias/?') == b'{"items":[]}'
+    assert await valor(backend, 'categorias', '/categorias/?page=2') is None
+
+
+async def test_invalidate_limpa_so_o_namespace(backend):
+    await guardar(backend, 'categorias', '/categorias/?', b'categorias')
+    await guardar(backend, 'centros_treinamento', '/centros_treinamento/?', b'centros')
+
+    await backend.invalidate('categorias')
+
+    assert await valor(backend, 'categorias', '/categorias/?') is None
+    assert await valor(backend, 'centros_treinamento', '/centros_treinamento/?') == b'centros'
+
+
+async def test_invalidate_de_namespace_vazio_nao_falha(backend):
+    await backend.invalidate('categorias')
+
+    assert await valor(backend, 'categorias', '/categorias/?') is None
+
+
+async def test_set_depois_de_invalidate_concorrente_nao_grava(backend):
+    # O GET erra o cache e consulta o banco; antes de ele gravar a página, um
+    # POST faz commit e invalida o namespace.
+    _, geracao = await backend.get('categorias', '/categorias/?')
+    await backend.invalidate('categorias')
+    await backend.set('categorias', '/categorias/?', b'pagina antiga', geracao)
+
+    assert await valor(backend, 'categorias', '/categorias/?') is None
+
+    await guardar(backend, 'categorias', '/categorias/?', b'pagina nova')
+    assert await valor(backend, 'categorias', '/categorias/?') == b'pagina nova'
+
+
+async def test_resposta_expira_depois_do_ttl(backend, relogio):
+    await guardar(backend, 'categorias', '/categorias/?', b'categorias')
+
+    relogio.avancar(TTL - 1)
+    assert await valor(backend, 'categorias', '/categorias/?') == b'categorias'
+
+    relogio.avancar(1)
+    assert await valor(backend, 'categorias', '/categorias/?') is None
+
+
+async def test_response_cache_conta_hits_e_misses(backend):
+    response_cache = ResponseCache(backend)
+    antes = {
+        resultado: response_cache_lookups.value(namespace='categorias', resultado=resultado)
+        for resultado in ('hit', 'miss')
+    }
+
+    _, geracao = await response_cache.get('categorias', '/categorias/?')
+    await response_cache.set('categorias', '/categorias/?', b'categorias', geracao)
+    await response_cache.get('categorias', '/categorias/?')
+
+    assert response_cache_lookups.value(namespace='categorias', resultado='miss') == antes['miss'] + 1
+    assert response_cache_lookups.value(namespace='categorias', resultado='hit') == antes['hit'] + 1
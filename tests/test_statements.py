@@ -0,0 +1,64 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def statements(response) -> int:
+    return int(response.headers['X-DB-Statements'])
+
+
+def atleta(cpf: str) -> dict:
+    return {
+        'nome': 'Joao', 'cpf': cpf, 'idade': 25, 'peso': 75.5, 'altura': 1.70, 'sexo': 'M',
+        'categoria': {'nome': 'Scale'}, 'centro_treinamento': {'nome': 'CT King'},
+    }
+
+
+@pytest.fixture
+async def referencias(client):
+    await client.post('/categorias/', json={'nome': 'Scale'})
+    await client.post(
+        '/centros_treinamento/', json={'nome': 'CT King', 'endereco': 'Rua X, Q02', 'proprietario': 'Marcos'}
+    )
+
+
+async def test_post_atleta_com_lookups_em_cache_faz_so_o_insert(client, referencias):
+    frio = await client.post('/atletas/', json=atleta('11111111111'))
+    quente = await client.post('/atletas/', json=atleta('22222222222'))
+
+    assert frio.status_code == quente.status_code == 201
+    assert statements(frio) == 3
+    assert statements(quente) == 1
+
+
+async def test_get_atleta_por_id_faz_um_select_com_join(client, referencias):
+    id = (await client.post('/atletas/', json=atleta('11111111111'))).json()['id']
+
+    response = await client.get(f'/atletas/{id}')
+
+    assert response.status_code == 200
+    assert response.json()['categoria'] == {'nome': 'Scale'}
+    assert response.json()['centro_treinamento'] == {'nome': 'CT King'}
+    assert statements(response) == 1
+
+
+async def test_get_atleta_por_id_com_etag_atual_le_so_a_versao(client, referencias):
+    id = (await client.post('/atletas/', json=atleta('11111111111'))).json()['id']
+    etag = (await client.get(f'/atletas/{id}')).headers['ETag']
+
+    atual = await client.get(f'/atletas/{id}', headers={'If-None-Match': etag})
+    velho = await client.get(f'/atletas/{id}', headers={'If-None-Match': '"desatualizado"'})
+
+    assert atual.status_code == 304
+    assert statements(atual) == 1
+    assert velho.status_code == 200
+    assert statements(velho) == 2
+
+
+async def test_lista_de_categorias_em_cache_responde_304_sem_ir_ao_banco(client, referencias):
+    primeira = await client.get('/categorias/')
+    revalidada = await client.get('/categorias/', headers={'If-None-Match': primeira.headers['ETag']})
+
+    assert statements(primeira) == 1
+    assert revalidada.status_code == 304
+    assert statements(revalidada) == 0
@@ -0,0 +1,78 @@
+import pytest
+
+from workoutapi.configs.settings import settings
+
+pytestmark = pytest.mark.anyio
+
+GROUP_BYS = ('categoria', 'centro_treinamento', 'sexo')
+
+
+def atleta(cpf: str, peso: float, altura: float, sexo: str = 'M', categoria: str = 'Scale') -> dict:
+    return {
+        'nome': 'Joao', 'cpf': cpf, 'idade': 25, 'peso': peso, 'altura': altura, 'sexo': sexo,
+        'categoria': {'nome': categoria}, 'centro_treinamento': {'nome': 'CT King'},
+    }
+
+
+def arredondar(valor):
+    if isinstance(valor, float):
+        return round(valor, 6)
+    if isinstance(valor, dict):
+        return {chave: arredondar(item) for chave, item in valor.items()}
+    if isinstance(valor, list):
+        return [arredondar(item) for item in valor]
+    return valor
+
+
+async def stats(client, monkeypatch, resumo: bool, group_by: str) -> dict:
+    monkeypatch.setattr(settings, 'STATS_RESUMO', resumo)
+    response = await client.get('/atletas/stats', params={'group_by': group_by})
+    assert response.status_code == 200
+    return arredondar(response.json())
+
+
+async def assert_resumo_igual_ao_agregado(client, monkeypatch) -> None:
+    for group_by in GROUP_BYS:
+        assert await stats(client, monkeypatch, True, group_by) == await stats(client, monkeypatch, False, group_by)
+
+
+@pytest.fixture
+async def referencias(client):
+    for nome in ('Scale', 'RX'):
+        await client.post('/categorias/', json={'nome': nome})
+    await client.post(
+        '/centros_treinamento/', json={'nome': 'CT King', 'endereco': 'Rua X, Q02', 'proprietario': 'Marcos'}
+    )
+
+
+async def test_resumo_acompanha_insert_patch_delete_e_bulk(client, referencias, monkeypatch):
+    ids = []
+    for dados in (
+        atleta('11111111111', 60, 1.60),
+        atleta('22222222222', 80, 1.90),
+        atleta('33333333333', 95, 1.75, sexo='F', categoria='RX'),
+    ):
+        response = await client.post('/atletas/', json=dados)
+        assert response.status_code == 201
+        ids.append(response.json()['id'])
+
+    stats_iniciais = await stats(client, monkeypatch, True, 'categoria')
+    assert stats_iniciais['total'] == 3
+    await assert_resumo_igual_ao_agregado(client, monkeypatch)
+
+    # Muda o IMC e a faixa sem mudar o grupo.
+    for id in ids[:2]:
+        assert (await client.patch(f'/atletas/{id}', json={'peso': 70})).status_code == 200
+    await assert_resumo_igual_ao_agregado(client, monkeypatch)
+
+    assert (await client.delete(f'/atletas/{ids[2]}')).status_code == 204
+    await assert_resumo_igual_ao_agregado(client, monkeypatch)
+
+    response = await client.post(
+        '/atletas/bulk',
+        json=[atleta('44444444444', 55, 1.80, sexo='F'), atleta('55555555555', 110, 1.70, categoria='RX')],
+    )
+    assert response.status_code == 200
+    await assert_resumo_igual_ao_agregado(client, monkeypatch)
+
+    assert (await stats(client, monkeypatch, True, 'categoria'))['total'] == 4
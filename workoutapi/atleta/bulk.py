@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import literal, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from workoutapi.atleta.cache import invalidate_cpfs
+from workoutapi.atleta.schemas import AtletaBulkErro, AtletaBulkOut, AtletaIn
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.lookups import categoria_ids, centro_treinamento_ids
+
+BULK_CONTENT_TYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+
+_COLUNAS = (
+    'id', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo',
+    'created_at', 'categoria_id', 'centro_treinamento_id',
+)
+_STAGING = 'atletas_staging'
+
+
+def _ler_json(body: bytes) -> list[tuple[int, Any]]:
+    try:
+        registros = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='O corpo da requisição não é um JSON válido'
+        )
+
+    if not isinstance(registros, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='O corpo da requisição deve ser uma lista de atletas'
+        )
+
+    return list(enumerate(registros, start=1))
+
+
+def _decodificar(body: bytes, encoding: str) -> str:
+    try:
+        return body.decode(encoding)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='O corpo da requisição deve estar codificado em UTF-8'
+        )
+
+
+def _ler_ndjson(body: bytes) -> list[tuple[int, Any]]:
+    registros = []
+    for linha, conteudo in enumerate(_decodificar(body, 'utf-8').splitlines(), start=1):
+        if not conteudo.strip():
+            continue
+        try:
+            registros.append((linha, json.loads(conteudo)))
+        except ValueError:
+            registros.append((linha, None))
+
+    return registros
+
+
+def _ler_csv(body: bytes) -> list[tuple[int, Any]]:
+    reader = csv.DictReader(io.StringIO(_decodificar(body, 'utf-8-sig')))
+
+    registros = []
+    try:
+        for linha, row in enumerate(reader, start=1):
+            row['categoria'] = {'nome': row.get('categoria')}
+            row['centro_treinamento'] = {'nome': row.get('centro_treinamento')}
+            registros.append((linha, row))
+    except csv.Error as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'CSV inválido na linha {reader.line_num}: {exc}'
+        )
+
+    return registros
+
+
+def ler_registros(content_type: Optional[str], body: bytes) -> list[tuple[int, Any]]:
+    media_type = (content_type or '').split(';')[0].strip().lower()
+
+    if media_type == 'application/json':
+        registros = _ler_json(body)
+    elif media_type in ('application/x-ndjson', 'application/ndjson'):
+        registros = _ler_ndjson(body)
+    elif media_type == 'text/csv':
+        registros = _ler_csv(body)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f'Formato não suportado: {media_type}. Use um de: {", ".join(BULK_CONTENT_TYPES)}'
+        )
+
+    if len(registros) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'O lote excede o limite de {settings.BULK_IMPORT_MAX_ROWS} atletas'
+        )
+
+    return registros
+
+
+def _mensagem_validacao(exc: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(parte) for parte in erro['loc'])}: {erro['msg']}"
+        for erro in exc.errors()
+    )
+
+
+async def _resolver_referencias(
+    db_session: AsyncSession,
+    categorias: list[str],
+    centros: list[str],
+) -> tuple[dict[str, int], dict[str, int]]:
+    referencias = select(
+        literal('categoria').label('tipo'), CategoriaModel.nome, CategoriaModel.pk_id
+    ).where(CategoriaModel.nome.in_(categorias)).union_all(
+        select(
+            literal('centro_treinamento').label('tipo'), CentroTreinamentoModel.nome, CentroTreinamentoModel.pk_id
+        ).where(CentroTreinamentoModel.nome.in_(centros))
+    )
+
+    categoria_por_nome, centro_por_nome = {}, {}
+    for tipo, nome, pk_id in (await db_session.execute(referencias)).all():
+        if tipo == 'categoria':
+            categoria_por_nome[nome] = pk_id
+            categoria_ids.set(nome, pk_id)
+        else:
+            centro_por_nome[nome] = pk_id
+            centro_treinamento_ids.set(nome, pk_id)
+
+    return categoria_por_nome, centro_por_nome
+
+
+async def importar_atletas(db_session: AsyncSession, registros: list[tuple[int, Any]]) -> AtletaBulkOut:
+    erros: list[AtletaBulkErro] = []
+    validos: list[tuple[int, AtletaIn]] = []
+
+    for linha, registro in registros:
+        if not isinstance(registro, dict):
+            erros.append(AtletaBulkErro(linha=linha, mensagem='Registro inválido'))
+            continue
+        try:
+            validos.append((linha, AtletaIn.model_validate(registro)))
+        except ValidationError as exc:
+            cpf = registro.get('cpf')
+            erros.append(AtletaBulkErro(
+                linha=linha, cpf=None if cpf is None else str(cpf), mensagem=_mensagem_validacao(exc)
+            ))
+
+    if not validos:
+        return AtletaBulkOut(inseridos=0, erros=erros)
+
+    categoria_por_nome, centro_por_nome = await _resolver_referencias(
+        db_session,
+        list({atleta.categoria.nome for _, atleta in validos}),
+        list({atleta.centro_treinamento.nome for _, atleta in validos}),
+    )
+
+    created_at = datetime.utcnow()
+    linha_por_cpf: dict[str, int] = {}
+    records = []
+
+    for linha, atleta in validos:
+        categoria_id = categoria_por_nome.get(atleta.categoria.nome)
+        centro_treinamento_id = centro_por_nome.get(atleta.centro_treinamento.nome)
+
+        if categoria_id is None:
+            mensagem = f'A categoria {atleta.categoria.nome} não foi encontrada'
+        elif centro_treinamento_id is None:
+            mensagem = f'O centro de treinamento {atleta.centro_treinamento.nome} não foi encontrado'
+        elif atleta.cpf in linha_por_cpf:
+            mensagem = f'CPF repetido no lote, já informado na linha {linha_por_cpf[atleta.cpf]}'
+        else:
+            mensagem = None
+
+        if mensagem:
+            erros.append(AtletaBulkErro(linha=linha, cpf=atleta.cpf, mensagem=mensagem))
+            continue
+
+        linha_por_cpf[atleta.cpf] = linha
+        records.append((
+            uuid4(), atleta.nome, atleta.cpf, atleta.idade, atleta.peso, atleta.altura, atleta.sexo,
+            created_at, categoria_id, centro_treinamento_id,
+        ))
+
+    inseridos: set[str] = set()
+    if records:
+        colunas = ', '.join(_COLUNAS)
+
+        await db_session.execute(text(
+            f'CREATE TEMP TABLE {_STAGING} ON COMMIT DROP AS '
+            f'SELECT {colunas} FROM atletas WITH NO DATA'
+        ))
+
+        connection = await db_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _STAGING, records=records, columns=_COLUNAS
+        )
+
+        inseridos = set((await db_session.execute(text(
+            f'INSERT INTO atletas ({colunas}) SELECT {colunas} FROM {_STAGING} '
+            f'ON CONFLICT (cpf) DO NOTHING RETURNING cpf'
+        ))).scalars().all())
+
+        await db_session.commit()
+        invalidate_cpfs(inseridos)
+
+    for cpf, linha in linha_por_cpf.items():
+        if cpf not in inseridos:
+            erros.append(AtletaBulkErro(
+                linha=linha, cpf=cpf, mensagem=f'Já existe um atleta cadastrado com o cpf: {cpf}'
+            ))
+
+    erros.sort(key=lambda erro: erro.linha)
+    return AtletaBulkOut(inseridos=len(inseridos), erros=erros)
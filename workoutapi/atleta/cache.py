@@ -0,0 +1,49 @@
+from typing import Iterable, Optional
+
+from workoutapi.atleta.schemas import AtletaOut
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.cache import TTLCache
+from workoutapi.contrib.metrics import Counter
+
+NAO_ENCONTRADO = object()
+
+atletas_por_cpf = TTLCache(ttl=settings.CPF_CACHE_TTL, maxsize=settings.CPF_CACHE_MAXSIZE)
+
+# Incrementada a cada invalidação: uma consulta ao banco que começou antes
+# dela não grava no cache o que leu.
+_geracao = 0
+
+cpf_cache_consultas = Counter('atleta_cpf_cache_lookups', 'Consultas por cpf, por resultado no cache', ['resultado'])
+
+
+def get_atleta(cpf: str):
+    atleta = atletas_por_cpf.get(cpf)
+    if atleta is None:
+        cpf_cache_consultas.inc(resultado='miss')
+    elif atleta is NAO_ENCONTRADO:
+        cpf_cache_consultas.inc(resultado='negative_hit')
+    else:
+        cpf_cache_consultas.inc(resultado='hit')
+
+    return atleta
+
+
+def geracao_cpfs() -> int:
+    return _geracao
+
+
+def set_atleta(cpf: str, atleta: Optional[AtletaOut], geracao: int) -> None:
+    if geracao != _geracao:
+        return
+
+    if atleta is None:
+        atletas_por_cpf.set(cpf, NAO_ENCONTRADO, ttl=settings.CPF_CACHE_MISS_TTL)
+    else:
+        atletas_por_cpf.set(cpf, atleta)
+
+
+def invalidate_cpfs(cpfs: Iterable[str]) -> None:
+    global _geracao
+    _geracao += 1
+    for cpf in cpfs:
+        atletas_por_cpf.invalidate(cpf)
@@ -1,23 +1,77 @@
 from datetime import datetime
+from typing import Optional, Union
 from uuid import uuid4
-from fastapi import FastApi, APIRouter, Body, HTTPException, status
-from fastapi_pagination import Page, add_pagination, paginate
+from fastapi import APIRouter, Body, Header, HTTPException, Path, Query, Request, status
 from pydantic import UUID4
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 from psycopg2.errors import UniqueViolation
 
 
 
-from workoutapi.atleta.schemas import AtletaIn, AtletaOut, AtletaUpdate
+from workoutapi.atleta.cache import NAO_ENCONTRADO, geracao_cpfs, get_atleta, invalidate_cpfs, set_atleta
+from workoutapi.atleta.filters import AtletaFiltros
+from workoutapi.atleta.export import EXPORT_MEDIA_TYPES, ExportFormato, export_query, exportar_atletas
+from workoutapi.atleta.bulk import BULK_CONTENT_TYPES, importar_atletas, ler_registros
+from workoutapi.atleta.schemas import (
+    AtletaBulkOut, AtletaBusca, AtletaIn, AtletaOut, AtletaStatsGrupo, AtletaStatsOut, AtletaUpdate,
+)
+from workoutapi.atleta.stats import IMC_FAIXAS, StatsGroupBy, stats_query, stats_resumo_query
 from workoutapi.atleta.models import AtletaModel
-from categorias.models import CategoriaModel
+from workoutapi.categorias.models import CategoriaModel
 from workoutapi.centro_treinamento.models import CentroTreinamentoModel
 
-from workoutapi.contrib.dependencies import DatabaseDependency
+from workoutapi.configs.database import read_session
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.dependencies import DatabaseDependency, ReadDatabaseDependency
+from workoutapi.contrib.idempotency import IdempotentRoute
+from workoutapi.contrib.etag import etag_json_response, not_modified, row_etag
+from workoutapi.contrib.lookups import categoria_ids, centro_treinamento_ids, get_categoria_id, get_centro_treinamento_id
+from workoutapi.contrib.responses import json_content_response, json_list_response, json_response
+from workoutapi.contrib.singleflight import SingleFlight
+from workoutapi.contrib.pagination import CursorPage, OffsetPage, TotalMode, paginate_cursor, paginate_offset
+from sqlalchemy import delete as sql_delete, func, union, update
 from sqlalchemy.future import select
+from sqlalchemy.orm import contains_eager
+
+router = APIRouter(route_class=IdempotentRoute)
+
+atletas_por_id = SingleFlight('atletas_por_id')
+
+_ATLETA_OUT_COLUNAS = ('id', 'created_at', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo')
+
+
+def _atletas_query():
+    # categoria e centro_treinamento são lazy='raise': quem lê atletas precisa
+    # trazê-los no mesmo SELECT, com um JOIN para cada relacionamento.
+    return (
+        select(AtletaModel)
+        .join(AtletaModel.categoria)
+        .join(AtletaModel.centro_treinamento)
+        .options(contains_eager(AtletaModel.categoria), contains_eager(AtletaModel.centro_treinamento))
+    )
+
+
+async def _carregar_atleta(id: UUID4) -> Optional[tuple[bytes, int]]:
+    # Sessão própria: a leitura é compartilhada entre requisições e não pode
+    # depender da sessão de quem a disparou.
+    async with read_session() as db_session:
+        atleta = (await db_session.execute(
+            _atletas_query().where(AtletaModel.id == id))
+        ).scalars().first()
+
+        if not atleta:
+            return None
+        return AtletaOut.model_validate(atleta).model_dump_json().encode(), atleta.version
+
+
+def _atleta_out(row) -> AtletaOut:
+    return AtletaOut(
+        **{coluna: row[coluna] for coluna in _ATLETA_OUT_COLUNAS},
+        categoria={'nome': row['categoria_nome']},
+        centro_treinamento={'nome': row['centro_treinamento_nome']},
+    )
 
-router = APIRouter()
 
 @router.post(
         "/",
@@ -33,32 +87,28 @@ async def post(
     centro_treinamento_nome = atleta_in.centro_treinamento.nome
 
 
-    categoria = (await db_session.execute(
-        select(CategoriaModel).filter_by(nome=categoria_nome))
-    ).scalars().first()
+    categoria_id = await get_categoria_id(db_session, categoria_nome)
 
-    if not categoria:
+    if categoria_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'A categoria {categoria_nome} não foi encontrada'
         )
     
-    centro_treinamento = (await db_session.execute(
-        select(CentroTreinamentoModel).filter_by(nome=centro_treinamento_nome))
-    ).scalars().first()
+    centro_treinamento_id = await get_centro_treinamento_id(db_session, centro_treinamento_nome)
 
-    if not centro_treinamento:
+    if centro_treinamento_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'O centro de treinamento {centro_treinamento_nome} não foi encontrado'
         )
     try:
     
-        atleta_out = AtletaOut(id=uuid4(), created_at=datetime.utc(), **atleta_in.model_dump())
+        atleta_out = AtletaOut(id=uuid4(), created_at=datetime.utcnow(), **atleta_in.model_dump())
         atleta_model = AtletaModel(**atleta_out.model_dump(exclude={'categoria', 'centro_treinamento'}))
 
-        atleta_model.categoria_id = categoria.pk_id
-        atleta_model.centro_treinamento_id = centro_treinamento.pk_id
+        atleta_model.categoria_id = categoria_id
+        atleta_model.centro_treinamento_id = centro_treinamento_id
 
         db_session.add(atleta_model)
         await db_session.commit()
@@ -71,6 +121,10 @@ async def post(
                 content={"message": f"Já existe um atleta cadastrado com o cpf: {conflicting_cpf}"}
             )
         else:
+            # Um pk_id em cache pode apontar para uma referência que não existe
+            # mais; descarta as entradas para que a próxima tentativa consulte o banco.
+            categoria_ids.invalidate(categoria_nome)
+            centro_treinamento_ids.invalidate(centro_treinamento_nome)
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"message": "Erro de integridade de dados"}
@@ -82,21 +136,173 @@ async def post(
             detail='Ocorreu um erro ao inserir os dados no banco'
         )
 
+    invalidate_cpfs([atleta_out.cpf])
     return atleta_out
 
+@router.post(
+        "/bulk",
+        summary="Importar atletas em lote",
+        status_code=status.HTTP_200_OK,
+        response_model=AtletaBulkOut,
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {content_type: {} for content_type in BULK_CONTENT_TYPES},
+            }
+        },
+)
+async def bulk(request: Request, db_session: DatabaseDependency) -> AtletaBulkOut:
+    registros = ler_registros(request.headers.get('content-type'), await request.body())
+
+    return await importar_atletas(db_session, registros)
+
 @router.get(
         "/",
         summary="Consultar todos os Atletas",
         status_code=status.HTTP_200_OK,
-        response_model=list[AtletaOut],
+        response_model=Union[CursorPage[AtletaOut], OffsetPage[AtletaOut]],
 )
-async def query(db_session: DatabaseDependency, page: int = 1, size: int = 10) -> Page[AtletaOut]:
-    atletas_query = select(AtletaModel)
-    atletas = await db_session.execute(atletas_query)
+async def query(
+    db_session: ReadDatabaseDependency,
+    filtros: AtletaFiltros,
+    cursor: Optional[str] = None,
+    page: Optional[int] = Query(None, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    total: TotalMode = 'exact',
+    if_none_match: Optional[str] = Header(None),
+) -> Union[CursorPage[AtletaOut], OffsetPage[AtletaOut]]:
+    atletas_query = _atletas_query().where(*filtros)
 
-    return paginate([AtletaOut.model_validate(atleta) for atleta in atletas.scalars().all()], page, size)
+    if page is None:
+        atletas = await paginate_cursor(db_session, atletas_query, AtletaModel, AtletaOut, cursor, size)
+    else:
+        atletas = await paginate_offset(db_session, atletas_query, AtletaModel, AtletaOut, page, size, total)
+
+    return etag_json_response(atletas, if_none_match)
+
+
+@router.get(
+        "/search",
+        summary="Buscar atletas por nome aproximado do atleta ou do centro de treinamento",
+        status_code=status.HTTP_200_OK,
+        response_model=list[AtletaBusca],
+)
+async def search(
+    db_session: ReadDatabaseDependency,
+    q: str = Query(..., min_length=3, max_length=50, description="Nome, ou parte dele, mesmo com erros de digitação"),
+    limit: int = Query(20, ge=1, le=100),
+) -> list[AtletaBusca]:
+    # %> compara q com cada palavra do nome (word_similarity) e é atendido
+    # pelos índices GIN gin_trgm_ops; o corte é pg_trgm.word_similarity_threshold.
+    # Os candidatos saem de um UNION para que cada lado use o seu índice, o
+    # que um OR entre as duas tabelas impediria.
+    candidatos = union(
+        select(AtletaModel.pk_id).where(AtletaModel.nome.bool_op('%>')(q)),
+        select(AtletaModel.pk_id)
+        .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == AtletaModel.centro_treinamento_id)
+        .where(CentroTreinamentoModel.nome.bool_op('%>')(q)),
+    )
+    similaridade = func.greatest(
+        func.word_similarity(q, AtletaModel.nome),
+        func.word_similarity(q, CentroTreinamentoModel.nome),
+    ).label('similaridade')
+
+    atletas = (await db_session.execute(
+        _atletas_query()
+        .add_columns(similaridade)
+        .where(AtletaModel.pk_id.in_(candidatos))
+        .order_by(similaridade.desc(), AtletaModel.pk_id)
+        .limit(limit)
+    )).all()
+
+    return json_list_response(AtletaBusca, [
+        AtletaBusca(**AtletaOut.model_validate(atleta).model_dump(), similaridade=valor)
+        for atleta, valor in atletas
+    ])
+
+
+@router.get(
+        "/stats",
+        summary="Estatísticas dos atletas por categoria, centro de treinamento ou sexo",
+        status_code=status.HTTP_200_OK,
+        response_model=AtletaStatsOut,
+)
+async def stats(
+    db_session: ReadDatabaseDependency,
+    filtros: AtletaFiltros,
+    group_by: StatsGroupBy = 'categoria',
+    if_none_match: Optional[str] = Header(None),
+) -> AtletaStatsOut:
+    if settings.STATS_RESUMO and not filtros:
+        stats_select = stats_resumo_query(group_by)
+    else:
+        stats_select = stats_query(group_by, filtros)
+
+    grupos = [
+        AtletaStatsGrupo(
+            **{coluna: row[coluna] for coluna in ('grupo', 'total', 'peso_medio', 'altura_media', 'idade_media', 'imc_medio')},
+            faixas_imc={nome: row[nome] for nome, _, _ in IMC_FAIXAS},
+        )
+        for row in (await db_session.execute(stats_select)).mappings()
+    ]
+
+    return etag_json_response(
+        AtletaStatsOut(group_by=group_by, total=sum(grupo.total for grupo in grupos), grupos=grupos), if_none_match
+    )
+
+
+@router.get(
+        "/export",
+        summary="Exportar todos os atletas em NDJSON ou CSV",
+        description=(
+            "NDJSON traz um atleta por linha no mesmo formato de AtletaOut. No CSV, categoria e "
+            "centro_treinamento são colunas com o nome."
+        ),
+        status_code=status.HTTP_200_OK,
+        response_class=StreamingResponse,
+        responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export(filtros: AtletaFiltros, formato: ExportFormato = 'ndjson') -> StreamingResponse:
+    return StreamingResponse(
+        exportar_atletas(export_query().where(*filtros), formato),
+        media_type=EXPORT_MEDIA_TYPES[formato],
+        headers={'Content-Disposition': f'attachment; filename="atletas.{formato}"'},
+    )
+
+
+@router.get(
+        "/by-cpf/{cpf}",
+        summary="Consultar um atleta pelo cpf",
+        status_code=status.HTTP_200_OK,
+        response_model=AtletaOut,
+)
+async def get_by_cpf(
+    db_session: DatabaseDependency,
+    cpf: str = Path(..., max_length=11),
+) -> AtletaOut:
+    # Totens consultam o mesmo cpf repetidas vezes, inclusive de quem ainda
+    # não tem cadastro: acertos e ausências ficam em cache no processo. As
+    # faltas são lidas do primário para que uma réplica atrasada não devolva
+    # ao cache o atleta que um PATCH ou DELETE acabou de invalidar.
+    atleta = get_atleta(cpf)
+
+    if atleta is None:
+        geracao = geracao_cpfs()
+        atleta_model = (await db_session.execute(
+            _atletas_query().where(AtletaModel.cpf == cpf))
+        ).scalars().first()
+
+        atleta = AtletaOut.model_validate(atleta_model) if atleta_model else None
+        set_atleta(cpf, atleta, geracao)
+
+    if atleta is None or atleta is NAO_ENCONTRADO:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta não encontrado no cpf: {cpf}'
+        )
+
+    return json_response(atleta)
 
-add_pagination(router) 
 
 @router.get(
         "/{id}",
@@ -104,18 +310,24 @@ add_pagination(router)
         status_code=status.HTTP_200_OK,
         response_model=AtletaOut,
 )
-async def get(id: UUID4, db_session: DatabaseDependency) -> AtletaOut:
-    atleta: AtletaOut = (await db_session.execute(
-        select(AtletaModel).filter_by(id=id))
-    ).scalars().first()
+async def get(
+    id: UUID4,
+    if_none_match: Optional[str] = Header(None),
+) -> AtletaOut:
+    resposta = await not_modified(AtletaModel, id, if_none_match)
+    if resposta:
+        return resposta
+
+    atleta = await atletas_por_id.do(id, lambda: _carregar_atleta(id))
 
     if not atleta:
         raise HTTPException(
-            status_code=status.HTTP_400_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Atleta não encontrado no id: {id}'
         )
 
-    return atleta
+    content, version = atleta
+    return json_content_response(content, headers={'ETag': row_etag(id, version)})
 
 @router.patch(
         "/{id}",
@@ -123,40 +335,56 @@ async def get(id: UUID4, db_session: DatabaseDependency) -> AtletaOut:
         status_code=status.HTTP_200_OK,
         response_model=AtletaOut,
 )
-async def get(id: UUID4, db_session: DatabaseDependency, atleta_up: AtletaUpdate = Body(...)) -> AtletaOut:
-    atleta: AtletaOut = (await db_session.execute(
-        select(AtletaModel).filter_by(id=id))
-    ).scalars().first()
+async def patch(id: UUID4, db_session: DatabaseDependency, atleta_up: AtletaUpdate = Body(...)) -> AtletaOut:
+    atleta_update = atleta_up.model_dump(exclude_unset=True, exclude_none=True)
+    if not atleta_update:
+        return await get(id, None)
+
+    # UPDATE ... RETURNING dentro de uma CTE: a linha atualizada já volta com
+    # os nomes de categoria e centro em uma única ida ao banco.
+    atleta_atualizado = (
+        update(AtletaModel)
+        .where(AtletaModel.id == id)
+        .values(**atleta_update, version=AtletaModel.version + 1)
+        .returning(*AtletaModel.__table__.c)
+        .cte('atleta_atualizado')
+    )
+    atleta = (await db_session.execute(
+        select(
+            *(atleta_atualizado.c[coluna] for coluna in _ATLETA_OUT_COLUNAS),
+            atleta_atualizado.c.version,
+            CategoriaModel.nome.label('categoria_nome'),
+            CentroTreinamentoModel.nome.label('centro_treinamento_nome'),
+        )
+        .join(CategoriaModel, CategoriaModel.pk_id == atleta_atualizado.c.categoria_id)
+        .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == atleta_atualizado.c.centro_treinamento_id)
+    )).mappings().first()
 
     if not atleta:
         raise HTTPException(
-            status_code=status.HTTP_400_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Atleta não encontrado no id: {id}'
         )
-    atleta_update = atleta_up.models_dump(exclude_unset=True)
-    for key, value in atleta_update.items():
-        setattr(atleta, key, value)
 
     await db_session.commit()
-    await db_session.refresh(atleta)
-    return atleta
+    invalidate_cpfs([atleta['cpf']])
+    return json_response(_atleta_out(atleta), headers={'ETag': row_etag(id, atleta['version'])})
 
-@router.get(
+@router.delete(
         "/{id}",
         summary="Deletar um atleta pelo id",
         status_code=status.HTTP_204_NO_CONTENT,
-        
 )
-async def get(id: UUID4, db_session: DatabaseDependency) -> None:
-    atleta: AtletaOut = (await db_session.execute(
-        select(AtletaModel).filter_by(id=id))
+async def delete(id: UUID4, db_session: DatabaseDependency) -> None:
+    cpf = (await db_session.execute(
+        sql_delete(AtletaModel).where(AtletaModel.id == id).returning(AtletaModel.cpf))
     ).scalars().first()
 
-    if not atleta:
+    if not cpf:
         raise HTTPException(
-            status_code=status.HTTP_400_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Atleta não encontrado no id: {id}'
         )
-    
-    await db_session.delete(atleta)
+
     await db_session.commit()
+    invalidate_cpfs([cpf])
@@ -0,0 +1,86 @@
+import csv
+import io
+from typing import AsyncIterator, Literal
+
+import orjson
+from sqlalchemy import Select
+from sqlalchemy.future import select
+
+from workoutapi.atleta.models import AtletaModel
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+from workoutapi.configs.database import read_session
+from workoutapi.configs.settings import settings
+
+ExportFormato = Literal['ndjson', 'csv']
+
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+EXPORT_COLUNAS = (
+    'id', 'created_at', 'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo', 'categoria', 'centro_treinamento',
+)
+
+
+def export_query() -> Select:
+    return (
+        select(
+            AtletaModel.id,
+            AtletaModel.created_at,
+            AtletaModel.nome,
+            AtletaModel.cpf,
+            AtletaModel.idade,
+            AtletaModel.peso,
+            AtletaModel.altura,
+            AtletaModel.sexo,
+            CategoriaModel.nome.label('categoria'),
+            CentroTreinamentoModel.nome.label('centro_treinamento'),
+        )
+        .join(CategoriaModel, CategoriaModel.pk_id == AtletaModel.categoria_id)
+        .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == AtletaModel.centro_treinamento_id)
+        .order_by(AtletaModel.pk_id)
+    )
+
+
+async def _lotes(query: Select) -> AsyncIterator[list]:
+    # A sessão é aberta aqui e não via DatabaseDependency: dependências com
+    # yield são encerradas antes do StreamingResponse começar a enviar o corpo.
+    async with read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for lote in result.partitions():
+            yield lote
+
+
+def _linha_ndjson(row) -> bytes:
+    # Mesmo formato de AtletaOut: categoria e centro como {"nome": ...}.
+    atleta = dict(row._mapping)
+    atleta['categoria'] = {'nome': atleta['categoria']}
+    atleta['centro_treinamento'] = {'nome': atleta['centro_treinamento']}
+    return orjson.dumps(atleta, default=str) + b'\n'
+
+
+async def _ndjson(query: Select) -> AsyncIterator[bytes]:
+    async for lote in _lotes(query):
+        yield b''.join(_linha_ndjson(row) for row in lote)
+
+
+async def _csv(query: Select) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUNAS)
+    async for lote in _lotes(query):
+        for row in lote:
+            writer.writerow((
+                row.id, row.created_at.isoformat(), row.nome, row.cpf, row.idade,
+                row.peso, row.altura, row.sexo, row.categoria, row.centro_treinamento,
+            ))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def exportar_atletas(query: Select, formato: ExportFormato) -> AsyncIterator[bytes]:
+    return _ndjson(query) if formato == 'ndjson' else _csv(query)
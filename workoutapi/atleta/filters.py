@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import Depends, Query
+from sqlalchemy import ColumnElement
+
+from workoutapi.atleta.models import AtletaModel
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+
+
+def _like_prefixo(prefixo: str) -> str:
+    return prefixo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def atleta_filtros(
+    nome: Annotated[Optional[str], Query(description="Início do nome do atleta", max_length=50)] = None,
+    cpf: Annotated[Optional[str], Query(description="CPF do atleta", max_length=11)] = None,
+    categoria: Annotated[Optional[str], Query(description="Nome da categoria")] = None,
+    centro_treinamento: Annotated[Optional[str], Query(description="Nome do centro de treinamento")] = None,
+    idade_min: Annotated[Optional[int], Query(description="Idade mínima", ge=0)] = None,
+    idade_max: Annotated[Optional[int], Query(description="Idade máxima", ge=0)] = None,
+    created_at_inicio: Annotated[Optional[datetime], Query(description="Criados a partir de")] = None,
+    created_at_fim: Annotated[Optional[datetime], Query(description="Criados antes de")] = None,
+) -> list[ColumnElement[bool]]:
+    # Os filtros por categoria e centro usam as tabelas já unidas pela
+    # consulta de atletas; os demais batem nos índices de atletas.
+    filtros = []
+
+    if nome:
+        filtros.append(AtletaModel.nome.like(_like_prefixo(nome), escape='\\'))
+    if cpf:
+        filtros.append(AtletaModel.cpf == cpf)
+    if categoria:
+        filtros.append(CategoriaModel.nome == categoria)
+    if centro_treinamento:
+        filtros.append(CentroTreinamentoModel.nome == centro_treinamento)
+    if idade_min is not None:
+        filtros.append(AtletaModel.idade >= idade_min)
+    if idade_max is not None:
+        filtros.append(AtletaModel.idade <= idade_max)
+    if created_at_inicio is not None:
+        filtros.append(AtletaModel.created_at >= created_at_inicio)
+    if created_at_fim is not None:
+        filtros.append(AtletaModel.created_at < created_at_fim)
+
+    return filtros
+
+
+AtletaFiltros = Annotated[list[ColumnElement[bool]], Depends(atleta_filtros)]
@@ -1,6 +1,7 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Float
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Float, Table, event, text
 from sqlalchemy.orm import Mapped, mapped_column , relationship
+from workoutapi.atleta.triggers import FUNCAO, FUNCAO_TRUNCATE, TRIGGERS
 from workoutapi.contrib.models import BaseModel 
 from workoutapi.categorias.models import CategoriaModel
 from workoutapi.centro_treinamento.models import CentroTreinamentoModel
@@ -8,6 +9,14 @@ from workoutapi.centro_treinamento.models import CentroTreinamentoModel
 
 class AtletaModel(BaseModel):
     __tablename__ = "atletas"
+    __table_args__ = (
+        Index('ix_atletas_nome_pattern', 'nome', postgresql_ops={'nome': 'varchar_pattern_ops'}),
+        Index('ix_atletas_nome_trgm', 'nome', postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}),
+        Index('ix_atletas_categoria_id_pk_id', 'categoria_id', 'pk_id'),
+        Index('ix_atletas_centro_treinamento_id_pk_id', 'centro_treinamento_id', 'pk_id'),
+        Index('ix_atletas_idade', 'idade'),
+        Index('ix_atletas_created_at', 'created_at'),
+    )
 
     pk_id: Mapped[int] = mapped_column (Integer, primary_key=True)
     nome: Mapped[str] = mapped_column (String(50), nullable=False)
@@ -17,8 +26,43 @@ class AtletaModel(BaseModel):
     altura: Mapped[float] = mapped_column (Float, nullable=False)
     sexo: Mapped[str] = mapped_column (String(1), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    categoria: Mapped["CategoriaModel"] = relationship(back_populates="atleta", lazy='selectin')
-    categoria_id = Mapped[int] = mapped_column(ForeignKey('categoria.pk_id'))
-    centro_treinamento: Mapped["CentroTreinamentoModel"] = relationship(back_populates="atleta")
-    centro_treinamento_id = Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
-    
+    categoria: Mapped["CategoriaModel"] = relationship(back_populates="atleta", lazy='raise')
+    categoria_id: Mapped[int] = mapped_column(ForeignKey('categoria.pk_id'))
+    centro_treinamento: Mapped["CentroTreinamentoModel"] = relationship(back_populates="atleta", lazy='raise')
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
+
+
+# Contagens e somas por (categoria, centro, sexo), mantidas pelos triggers de
+# atletas (workoutapi.atleta.triggers): /atletas/stats lê um punhado de linhas em
+# vez de agregar a tabela inteira. As médias saem de soma / total.
+atletas_resumo = Table(
+    'atletas_resumo',
+    BaseModel.metadata,
+    Column('categoria_id', Integer, primary_key=True),
+    Column('centro_treinamento_id', Integer, primary_key=True),
+    Column('sexo', String(1), primary_key=True),
+    Column('total', BigInteger, nullable=False),
+    Column('soma_peso', Float, nullable=False),
+    Column('soma_altura', Float, nullable=False),
+    Column('soma_idade', BigInteger, nullable=False),
+    Column('soma_imc', Float, nullable=False),
+    Column('imc_abaixo_do_peso', BigInteger, nullable=False),
+    Column('imc_normal', BigInteger, nullable=False),
+    Column('imc_sobrepeso', BigInteger, nullable=False),
+    Column('imc_obesidade', BigInteger, nullable=False),
+)
+
+
+# Quem cria o esquema com metadata.create_all, como os testes, recebe os mesmos
+# triggers que a migration instala. Os triggers são criados junto com atletas
+# e somem no DROP TABLE dela; as funções não dependem de atletas_resumo existir
+# ao serem criadas.
+@event.listens_for(AtletaModel.__table__, 'after_create')
+def _criar_triggers_resumo(target, connection, **kw):
+    for ddl in (FUNCAO, FUNCAO_TRUNCATE, *TRIGGERS):
+        connection.execute(text(ddl))
+
+
+@event.listens_for(AtletaModel.__table__, 'after_drop')
+def _remover_funcoes_resumo(target, connection, **kw):
+    connection.execute(text('DROP FUNCTION IF EXISTS atletas_resumo_limpar(), atletas_resumo_atualizar()'))
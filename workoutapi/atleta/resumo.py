@@ -0,0 +1,63 @@
+"""Reconstrói atletas_resumo a partir de atletas.
+
+Os triggers de atletas mantêm o resumo em dia a cada escrita; rode isto depois
+de cargas feitas com os triggers desabilitados, restaurações parciais ou para
+zerar o desvio acumulado nas somas em ponto flutuante. Escritas em atletas
+ficam bloqueadas enquanto o resumo é recalculado.
+
+    python -m workoutapi.atleta.resumo
+"""
+import asyncio
+
+from sqlalchemy import and_, delete, func, insert, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+
+from workoutapi.atleta.models import atletas_resumo
+from workoutapi.atleta.stats import resumo_query
+from workoutapi.configs.database import engine
+
+_CHAVE = ('categoria_id', 'centro_treinamento_id', 'sexo')
+_CONTAGENS = ('total', 'soma_idade', 'imc_abaixo_do_peso', 'imc_normal', 'imc_sobrepeso', 'imc_obesidade')
+
+
+async def reconciliar(engine: AsyncEngine) -> dict:
+    async with engine.begin() as conn:
+        # SHARE bloqueia INSERT, UPDATE e DELETE em atletas (e com eles os
+        # triggers) até o COMMIT, mas não as leituras.
+        await conn.execute(text('LOCK TABLE atletas IN SHARE MODE'))
+
+        # Só as colunas inteiras entram na comparação: as somas de peso,
+        # altura e IMC sempre diferem nas últimas casas.
+        atual = resumo_query().subquery('atual')
+        resumo = atletas_resumo.c
+        divergentes = await conn.scalar(
+            select(func.count())
+            .select_from(atual.outerjoin(
+                atletas_resumo, and_(*(atual.c[coluna] == resumo[coluna] for coluna in _CHAVE)), full=True
+            ))
+            .where(
+                tuple_(*(func.coalesce(atual.c[coluna], 0) for coluna in _CONTAGENS))
+                .is_distinct_from(tuple_(*(func.coalesce(resumo[coluna], 0) for coluna in _CONTAGENS)))
+            )
+        )
+
+        await conn.execute(delete(atletas_resumo))
+        grupos = (await conn.execute(
+            insert(atletas_resumo).from_select([coluna.name for coluna in atletas_resumo.c], resumo_query())
+        )).rowcount
+
+    return {'grupos': grupos, 'divergentes': divergentes}
+
+
+async def main() -> None:
+    try:
+        resultado = await reconciliar(engine)
+    finally:
+        await engine.dispose()
+
+    print(f"atletas_resumo reconstruído: {resultado['grupos']} grupos, {resultado['divergentes']} divergentes")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
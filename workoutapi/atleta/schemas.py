@@ -1,18 +1,18 @@
 from typing import Annotated, Optional
 
-from centro_treinamento.schemas import CentroTreinamentoAtleta
+from workoutapi.centro_treinamento.schemas import CentroTreinamentoAtleta
 from workoutapi.contrib.schemas import BaseSchema, OutMixin
 from pydantic import BaseModel, Field, PositiveFloat
 from workoutapi.categorias.schemas import CategoriaIn
 
 
 class Atleta(BaseSchema):
-    nome: Annotated[str, Field(description="Nome do atleta", examples="Joao", max_length=50)]    
-    cpf: Annotated[str, Field(description="CPF do atleta", examples="12345678900", max_length=11)]
-    idade: Annotated[int, Field(description="Idade do atleta", examples=25)]
-    peso: Annotated[PositiveFloat, Field(description="Peso do atleta", examples=75.5)]
-    altura: Annotated[PositiveFloat, Field(description="Altura do atleta", examples=1.70)]
-    sexo: Annotated[int, Field(description="Sexo do atleta", examples="M", max_length=1)]
+    nome: Annotated[str, Field(description="Nome do atleta", examples=["Joao"], max_length=50)]    
+    cpf: Annotated[str, Field(description="CPF do atleta", examples=["12345678900"], max_length=11)]
+    idade: Annotated[int, Field(description="Idade do atleta", examples=[25])]
+    peso: Annotated[PositiveFloat, Field(description="Peso do atleta", examples=[75.5])]
+    altura: Annotated[PositiveFloat, Field(description="Altura do atleta", examples=[1.70])]
+    sexo: Annotated[str, Field(description="Sexo do atleta", examples=["M"], max_length=1)]
     categoria: Annotated[CategoriaIn, Field(description='Categoria do Atleta')]
     centro_treinamento: Annotated[CentroTreinamentoAtleta, Field(description='Categoria do Atleta')]
 
@@ -23,8 +23,41 @@ class AtletaIn(Atleta):
 class AtletaOut(Atleta, OutMixin):
     pass
 
-class AtletaUpdate(BaseSchema):
-    nome: Annotated[Optional[str], Field(description="Nome do atleta", examples="Joao", max_length=50)]
-    idade: Annotated[Optional[int], Field(description="Idade do atleta", examples=25)]
-
+class AtletaBusca(AtletaOut):
+    similaridade: Annotated[float, Field(description="Semelhança entre o termo buscado e o nome do atleta ou do centro", examples=[0.82])]
 
+class AtletaUpdate(BaseSchema):
+    nome: Annotated[Optional[str], Field(description="Nome do atleta", examples=["Joao"], max_length=50)] = None
+    idade: Annotated[Optional[int], Field(description="Idade do atleta", examples=[25])] = None
+    peso: Annotated[Optional[PositiveFloat], Field(description="Peso do atleta", examples=[75.5])] = None
+
+
+class AtletaBulkErro(BaseSchema):
+    linha: Annotated[int, Field(description="Posição do registro no lote, a partir de 1", examples=[1])]
+    cpf: Annotated[Optional[str], Field(description="CPF informado no registro", examples=["12345678900"])] = None
+    mensagem: Annotated[str, Field(description="Motivo da rejeição do registro")]
+
+class AtletaBulkOut(BaseSchema):
+    inseridos: Annotated[int, Field(description="Quantidade de atletas inseridos", examples=[100])]
+    erros: Annotated[list[AtletaBulkErro], Field(description="Registros rejeitados")]
+
+
+class AtletaStatsFaixasImc(BaseSchema):
+    abaixo_do_peso: Annotated[int, Field(description="Atletas com IMC abaixo de 18,5", examples=[3])]
+    normal: Annotated[int, Field(description="Atletas com IMC de 18,5 a 25", examples=[40])]
+    sobrepeso: Annotated[int, Field(description="Atletas com IMC de 25 a 30", examples=[20])]
+    obesidade: Annotated[int, Field(description="Atletas com IMC a partir de 30", examples=[5])]
+
+class AtletaStatsGrupo(BaseSchema):
+    grupo: Annotated[str, Field(description="Nome da categoria, do centro de treinamento ou sexo", examples=["Scale"])]
+    total: Annotated[int, Field(description="Quantidade de atletas no grupo", examples=[68])]
+    peso_medio: Annotated[float, Field(description="Peso médio", examples=[72.4])]
+    altura_media: Annotated[float, Field(description="Altura média", examples=[1.71])]
+    idade_media: Annotated[float, Field(description="Idade média", examples=[29.3])]
+    imc_medio: Annotated[float, Field(description="IMC médio", examples=[24.7])]
+    faixas_imc: Annotated[AtletaStatsFaixasImc, Field(description="Atletas por faixa de IMC")]
+
+class AtletaStatsOut(BaseSchema):
+    group_by: Annotated[str, Field(description="Campo usado no agrupamento", examples=["categoria"])]
+    total: Annotated[int, Field(description="Quantidade de atletas em todos os grupos", examples=[68])]
+    grupos: Annotated[list[AtletaStatsGrupo], Field(description="Estatísticas de cada grupo")]
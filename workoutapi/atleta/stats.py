@@ -0,0 +1,113 @@
+from typing import Literal
+
+from sqlalchemy import ColumnElement, Select, func
+from sqlalchemy.future import select
+
+from workoutapi.atleta.models import AtletaModel, atletas_resumo
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+
+StatsGroupBy = Literal['categoria', 'centro_treinamento', 'sexo']
+
+STATS_GRUPOS = {
+    'categoria': CategoriaModel.nome,
+    'centro_treinamento': CentroTreinamentoModel.nome,
+    'sexo': AtletaModel.sexo,
+}
+
+# Limites da OMS; cada faixa vai do seu limite até o da próxima.
+IMC_FAIXAS = (
+    ('abaixo_do_peso', None, 18.5),
+    ('normal', 18.5, 25.0),
+    ('sobrepeso', 25.0, 30.0),
+    ('obesidade', 30.0, None),
+)
+
+
+def atleta_imc() -> ColumnElement[float]:
+    return AtletaModel.peso / (AtletaModel.altura * AtletaModel.altura)
+
+
+def imc_faixa(imc: ColumnElement[float], minimo, maximo) -> ColumnElement[bool]:
+    if minimo is None:
+        return imc < maximo
+    if maximo is None:
+        return imc >= minimo
+    return (imc >= minimo) & (imc < maximo)
+
+
+def stats_query(group_by: StatsGroupBy, filtros: list[ColumnElement[bool]]) -> Select:
+    # Tudo é agregado no banco: a resposta tem uma linha por grupo, nunca uma
+    # por atleta. Os JOINs ficam sempre porque os filtros podem usar os nomes
+    # de categoria e centro.
+    grupo = STATS_GRUPOS[group_by]
+    imc = atleta_imc()
+
+    return (
+        select(
+            grupo.label('grupo'),
+            func.count().label('total'),
+            func.avg(AtletaModel.peso).label('peso_medio'),
+            func.avg(AtletaModel.altura).label('altura_media'),
+            func.avg(AtletaModel.idade).label('idade_media'),
+            func.avg(imc).label('imc_medio'),
+            *(
+                func.count().filter(imc_faixa(imc, minimo, maximo)).label(nome)
+                for nome, minimo, maximo in IMC_FAIXAS
+            ),
+        )
+        .join(CategoriaModel, CategoriaModel.pk_id == AtletaModel.categoria_id)
+        .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == AtletaModel.centro_treinamento_id)
+        .where(*filtros)
+        .group_by(grupo)
+        .order_by(func.count().desc(), grupo)
+    )
+
+
+def stats_resumo_query(group_by: StatsGroupBy) -> Select:
+    # Sem filtros, as mesmas estatísticas saem de atletas_resumo, que tem uma
+    # linha por (categoria, centro, sexo) em vez de uma por atleta.
+    resumo = atletas_resumo.c
+    grupo = resumo.sexo if group_by == 'sexo' else STATS_GRUPOS[group_by]
+    total = func.sum(resumo.total)
+
+    return (
+        select(
+            grupo.label('grupo'),
+            total.label('total'),
+            (func.sum(resumo.soma_peso) / total).label('peso_medio'),
+            (func.sum(resumo.soma_altura) / total).label('altura_media'),
+            (func.sum(resumo.soma_idade) / total).label('idade_media'),
+            (func.sum(resumo.soma_imc) / total).label('imc_medio'),
+            *(func.sum(resumo[f'imc_{nome}']).label(nome) for nome, _, _ in IMC_FAIXAS),
+        )
+        .select_from(atletas_resumo)
+        .join(CategoriaModel, CategoriaModel.pk_id == resumo.categoria_id)
+        .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == resumo.centro_treinamento_id)
+        .group_by(grupo)
+        .having(total > 0)
+        .order_by(total.desc(), grupo)
+    )
+
+
+def resumo_query() -> Select:
+    # Recalcula atletas_resumo inteiro a partir de atletas, nas mesmas colunas
+    # que os triggers mantêm.
+    imc = atleta_imc()
+    return (
+        select(
+            AtletaModel.categoria_id,
+            AtletaModel.centro_treinamento_id,
+            AtletaModel.sexo,
+            func.count().label('total'),
+            func.sum(AtletaModel.peso).label('soma_peso'),
+            func.sum(AtletaModel.altura).label('soma_altura'),
+            func.sum(AtletaModel.idade).label('soma_idade'),
+            func.sum(imc).label('soma_imc'),
+            *(
+                func.count().filter(imc_faixa(imc, minimo, maximo)).label(f'imc_{nome}')
+                for nome, minimo, maximo in IMC_FAIXAS
+            ),
+        )
+        .group_by(AtletaModel.categoria_id, AtletaModel.centro_treinamento_id, AtletaModel.sexo)
+    )
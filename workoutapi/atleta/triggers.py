@@ -0,0 +1,84 @@
+# Triggers por statement com tabelas de transição: um INSERT em lote (ou um
+# COPY) de N atletas faz um único upsert por grupo afetado, e não N. Cada
+# linha entra com sinal 1 (novos) ou -1 (antigos); UPDATE soma os dois.
+# As faixas de IMC são as de workoutapi.atleta.stats.IMC_FAIXAS.
+#
+# Usado pela migration 7c2e4b9f1d36 e pelo create_all (models.py), para que
+# os dois caminhos criem o mesmo esquema.
+FUNCAO = """
+CREATE OR REPLACE FUNCTION atletas_resumo_atualizar() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    linhas text;
+BEGIN
+    linhas := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT 1 AS sinal, * FROM novos'
+        WHEN 'DELETE' THEN 'SELECT -1 AS sinal, * FROM antigos'
+        ELSE 'SELECT 1 AS sinal, * FROM novos UNION ALL SELECT -1, * FROM antigos'
+    END;
+
+    EXECUTE format($sql$
+        INSERT INTO atletas_resumo AS r (
+            categoria_id, centro_treinamento_id, sexo, total, soma_peso, soma_altura, soma_idade, soma_imc,
+            imc_abaixo_do_peso, imc_normal, imc_sobrepeso, imc_obesidade
+        )
+        SELECT * FROM (
+            SELECT
+                categoria_id, centro_treinamento_id, sexo,
+                sum(sinal), sum(sinal * peso), sum(sinal * altura), sum(sinal * idade),
+                sum(sinal * peso / (altura * altura)),
+                coalesce(sum(sinal) FILTER (WHERE peso / (altura * altura) < 18.5), 0),
+                coalesce(sum(sinal) FILTER (WHERE peso / (altura * altura) >= 18.5 AND peso / (altura * altura) < 25), 0),
+                coalesce(sum(sinal) FILTER (WHERE peso / (altura * altura) >= 25 AND peso / (altura * altura) < 30), 0),
+                coalesce(sum(sinal) FILTER (WHERE peso / (altura * altura) >= 30), 0)
+            FROM (%s) AS linhas
+            GROUP BY categoria_id, centro_treinamento_id, sexo
+            -- Um UPDATE só de nome ou cpf não muda o resumo nem bloqueia o grupo.
+            -- Todas as colunas entram: pesos trocados dentro do grupo podem
+            -- somar zero e ainda assim mudar o IMC e as faixas.
+            HAVING sum(sinal) <> 0 OR sum(sinal * peso) <> 0 OR sum(sinal * altura) <> 0 OR sum(sinal * idade) <> 0
+                OR sum(sinal * peso / (altura * altura)) <> 0
+                OR sum(sinal) FILTER (WHERE peso / (altura * altura) < 18.5) <> 0
+                OR sum(sinal) FILTER (WHERE peso / (altura * altura) >= 18.5 AND peso / (altura * altura) < 25) <> 0
+                OR sum(sinal) FILTER (WHERE peso / (altura * altura) >= 25 AND peso / (altura * altura) < 30) <> 0
+                OR sum(sinal) FILTER (WHERE peso / (altura * altura) >= 30) <> 0
+            -- Ordem fixa dos grupos: transações concorrentes os bloqueiam na
+            -- mesma sequência e não entram em deadlock.
+            ORDER BY categoria_id, centro_treinamento_id, sexo
+        ) AS delta
+        ON CONFLICT (categoria_id, centro_treinamento_id, sexo) DO UPDATE SET
+            total = r.total + excluded.total,
+            soma_peso = r.soma_peso + excluded.soma_peso,
+            soma_altura = r.soma_altura + excluded.soma_altura,
+            soma_idade = r.soma_idade + excluded.soma_idade,
+            soma_imc = r.soma_imc + excluded.soma_imc,
+            imc_abaixo_do_peso = r.imc_abaixo_do_peso + excluded.imc_abaixo_do_peso,
+            imc_normal = r.imc_normal + excluded.imc_normal,
+            imc_sobrepeso = r.imc_sobrepeso + excluded.imc_sobrepeso,
+            imc_obesidade = r.imc_obesidade + excluded.imc_obesidade
+    $sql$, linhas);
+
+    RETURN NULL;
+END
+$$
+"""
+
+FUNCAO_TRUNCATE = """
+CREATE OR REPLACE FUNCTION atletas_resumo_limpar() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM atletas_resumo;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = (
+    'CREATE TRIGGER atletas_resumo_insert AFTER INSERT ON atletas REFERENCING NEW TABLE AS novos '
+    'FOR EACH STATEMENT EXECUTE FUNCTION atletas_resumo_atualizar()',
+    'CREATE TRIGGER atletas_resumo_update AFTER UPDATE ON atletas REFERENCING OLD TABLE AS antigos NEW TABLE AS novos '
+    'FOR EACH STATEMENT EXECUTE FUNCTION atletas_resumo_atualizar()',
+    'CREATE TRIGGER atletas_resumo_delete AFTER DELETE ON atletas REFERENCING OLD TABLE AS antigos '
+    'FOR EACH STATEMENT EXECUTE FUNCTION atletas_resumo_atualizar()',
+    'CREATE TRIGGER atletas_resumo_truncate AFTER TRUNCATE ON atletas '
+    'FOR EACH STATEMENT EXECUTE FUNCTION atletas_resumo_limpar()',
+)
+
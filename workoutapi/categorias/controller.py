@@ -1,5 +1,6 @@
+from typing import Optional, Union
 from uuid import uuid4
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from pydantic import UUID4
 from sqlalchemy.exc import IntegrityError, ProgrammingError
@@ -7,10 +8,33 @@ from psycopg2.errors import UniqueViolation
 
 from workoutapi.categorias.schemas import CategoriaIn, CategoriaOut
 from workoutapi.categorias.models import CategoriaModel
+from workoutapi.configs.database import read_session
 from workoutapi.contrib.dependencies import DatabaseDependency
+from workoutapi.contrib.lookups import categoria_ids
+from workoutapi.contrib.idempotency import IdempotentRoute
+from workoutapi.contrib.etag import etag_content_response, not_modified, row_etag
+from workoutapi.contrib.responses import json_content_response, json_response
+from workoutapi.contrib.upsert import OnConflict, upsert_by_nome
+from workoutapi.contrib.singleflight import SingleFlight
+from workoutapi.contrib.response_cache import cache_key, response_cache
+from workoutapi.contrib.pagination import CursorPage, OffsetPage, TotalMode, paginate_cursor, paginate_offset
 from sqlalchemy.future import select
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
+
+categorias_por_id = SingleFlight('categorias_por_id')
+
+
+async def _carregar_categoria(id: UUID4) -> Optional[tuple[bytes, int]]:
+    async with read_session() as db_session:
+        categoria = (await db_session.execute(
+            select(CategoriaModel).filter_by(id=id))
+        ).scalars().first()
+
+        if not categoria:
+            return None
+        return CategoriaOut.model_validate(categoria).model_dump_json().encode(), categoria.version
+
 
 @router.post(
         "/",
@@ -18,13 +42,33 @@ router = APIRouter()
         status_code=status.HTTP_201_CREATED,
         response_model=CategoriaOut,
 )
-async def post(db_session: DatabaseDependency, categoria_in: CategoriaIn = Body(...)):
+async def post(
+    db_session: DatabaseDependency,
+    categoria_in: CategoriaIn = Body(...),
+    on_conflict: Optional[OnConflict] = Query(None, description="Se a categoria já existir: update ou ignore, sem erro de conflito"),
+):
+    if on_conflict is not None:
+        categoria, alterada = await upsert_by_nome(db_session, CategoriaModel, categoria_in.model_dump(), on_conflict)
+        await db_session.commit()
+
+        if alterada:
+            categoria_ids.invalidate(categoria_in.nome)
+            await response_cache.invalidate('categorias')
+
+        return json_response(
+            CategoriaOut(**{campo: categoria[campo] for campo in CategoriaOut.model_fields}),
+            status_code=status.HTTP_201_CREATED if categoria['inserido'] else status.HTTP_200_OK,
+            headers={'ETag': row_etag(categoria['id'], categoria['version'])},
+        )
+
     categoria_out = CategoriaOut(id=uuid4(), **categoria_in.model_dump())
     categoria_model = CategoriaModel(**categoria_out.model_dump())
 
     try:
         db_session.add(categoria_model)
         await db_session.commit()
+        categoria_ids.invalidate(categoria_in.nome)
+        await response_cache.invalidate('categorias')
     except IntegrityError as exc:
         if isinstance(exc.orig, UniqueViolation):
             conflicting_nome = exc.params.get('nome')
@@ -51,13 +95,35 @@ async def post(db_session: DatabaseDependency, categoria_in: CategoriaIn = Body(
     "/",
     summary="Consultar todas as categorias",
     status_code=status.HTTP_200_OK,
-    response_model=Page[CategoriaOut],
+    response_model=Union[CursorPage[CategoriaOut], OffsetPage[CategoriaOut]],
 )
-async def query(db_session: DatabaseDependency, page: int = 1, size: int = 10) -> Page[CategoriaOut]:
+async def query(
+    request: Request,
+    db_session: DatabaseDependency,
+    cursor: Optional[str] = None,
+    page: Optional[int] = Query(None, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    total: TotalMode = 'exact',
+    if_none_match: Optional[str] = Header(None),
+) -> Union[CursorPage[CategoriaOut], OffsetPage[CategoriaOut]]:
+    chave = cache_key(request)
+    content, geracao = await response_cache.get('categorias', chave)
+    if content is not None:
+        return etag_content_response(content, if_none_match)
+
+    # Lida do primário, não da réplica: o resultado fica no cache pelo TTL
+    # inteiro, e uma réplica atrasada gravaria de volta o que o POST acabou de
+    # invalidar. Com o cache quente a sessão nem chega a abrir conexão.
     categorias_query = select(CategoriaModel)
-    categorias = await db_session.execute(categorias_query)
 
-    return paginate([CategoriaOut.model_validate(categoria) for categoria in categorias.scalars().all()], page, size)
+    if page is None:
+        categorias = await paginate_cursor(db_session, categorias_query, CategoriaModel, CategoriaOut, cursor, size)
+    else:
+        categorias = await paginate_offset(db_session, categorias_query, CategoriaModel, CategoriaOut, page, size, total)
+
+    content = categorias.model_dump_json().encode()
+    await response_cache.set('categorias', chave, content, geracao)
+    return etag_content_response(content, if_none_match)
 
 
 @router.get(
@@ -66,17 +132,22 @@ async def query(db_session: DatabaseDependency, page: int = 1, size: int = 10) -
         status_code=status.HTTP_200_OK,
         response_model=CategoriaOut,
 )
-async def query(id: UUID4, db_session: DatabaseDependency) -> list[CategoriaOut]:
-    categoria: CategoriaOut = (await db_session.execute(
-        select(CategoriaModel).filter_by(id=id))
-    ).scalars().first()
+async def get(
+    id: UUID4,
+    if_none_match: Optional[str] = Header(None),
+) -> CategoriaOut:
+    resposta = await not_modified(CategoriaModel, id, if_none_match)
+    if resposta:
+        return resposta
+
+    categoria = await categorias_por_id.do(id, lambda: _carregar_categoria(id))
 
     if not categoria:
         raise HTTPException(
-            status_code=status.HTTP_400_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Categoria não encontrada no id: {id}'
         )
 
-    return categoria
+    content, version = categoria
+    return json_content_response(content, headers={'ETag': row_etag(id, version)})
 
-add_pagination(router)
@@ -1,7 +1,10 @@
+from typing import TYPE_CHECKING
 from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from workoutapi.contrib.models import BaseModel
-from workoutapi.atleta.models import AtletaModel
+
+if TYPE_CHECKING:
+    from workoutapi.atleta.models import AtletaModel
 
 
 class CategoriaModel(BaseModel):
@@ -9,5 +12,5 @@ class CategoriaModel(BaseModel):
 
     pk_id: Mapped[int] = mapped_column (Integer, primary_key=True)
     nome: Mapped[str] = mapped_column (String(50), unique=True, nullable=False)
-    atleta: Mapped["AtletaModel"] = relationship(back_populates="categoria")
+    atleta: Mapped[list["AtletaModel"]] = relationship(back_populates="categoria")
     
\ No newline at end of file
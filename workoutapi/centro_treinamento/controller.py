@@ -1,16 +1,39 @@
+from typing import Optional, Union
 from uuid import uuid4
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
-from fastapi.pagination import Page, add_pagination, paginate
 from pydantic import UUID4
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 from psycopg2.errors import UniqueViolation
-from workoutapi.centro_treinamento import CentroTreinamentoIn, CentroTreinamentoOut
+from workoutapi.centro_treinamento.schemas import CentroTreinamentoIn, CentroTreinamentoOut
 from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+from workoutapi.configs.database import read_session
 from workoutapi.contrib.dependencies import DatabaseDependency
+from workoutapi.contrib.lookups import centro_treinamento_ids
+from workoutapi.contrib.idempotency import IdempotentRoute
+from workoutapi.contrib.etag import etag_content_response, not_modified, row_etag
+from workoutapi.contrib.responses import json_content_response, json_response
+from workoutapi.contrib.upsert import OnConflict, upsert_by_nome
+from workoutapi.contrib.singleflight import SingleFlight
+from workoutapi.contrib.response_cache import cache_key, response_cache
+from workoutapi.contrib.pagination import CursorPage, OffsetPage, TotalMode, paginate_cursor, paginate_offset
 from sqlalchemy.future import select
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
+
+centros_por_id = SingleFlight('centros_treinamento_por_id')
+
+
+async def _carregar_centro_treinamento(id: UUID4) -> Optional[tuple[bytes, int]]:
+    async with read_session() as db_session:
+        centro_treinamento = (await db_session.execute(
+            select(CentroTreinamentoModel).filter_by(id=id))
+        ).scalars().first()
+
+        if not centro_treinamento:
+            return None
+        return CentroTreinamentoOut.model_validate(centro_treinamento).model_dump_json().encode(), centro_treinamento.version
+
 
 @router.post(
         "/",
@@ -20,14 +43,33 @@ router = APIRouter()
 )
 async def post(
     db_session: DatabaseDependency, 
-    centro_treinamento_in: CentroTreinamentoIn = Body(...)
+    centro_treinamento_in: CentroTreinamentoIn = Body(...),
+    on_conflict: Optional[OnConflict] = Query(None, description="Se o centro já existir: update ou ignore, sem erro de conflito"),
 ) -> CentroTreinamentoOut:
+    if on_conflict is not None:
+        centro_treinamento, alterado = await upsert_by_nome(
+            db_session, CentroTreinamentoModel, centro_treinamento_in.model_dump(), on_conflict
+        )
+        await db_session.commit()
+
+        if alterado:
+            centro_treinamento_ids.invalidate(centro_treinamento_in.nome)
+            await response_cache.invalidate('centros_treinamento')
+
+        return json_response(
+            CentroTreinamentoOut(**{campo: centro_treinamento[campo] for campo in CentroTreinamentoOut.model_fields}),
+            status_code=status.HTTP_201_CREATED if centro_treinamento['inserido'] else status.HTTP_200_OK,
+            headers={'ETag': row_etag(centro_treinamento['id'], centro_treinamento['version'])},
+        )
+
     centro_treinamento_out = CentroTreinamentoOut(id=uuid4(), **centro_treinamento_in.model_dump())
     centro_treinamento_model = CentroTreinamentoModel(**centro_treinamento_out.model_dump())
 
     try:
         db_session.add(centro_treinamento_model)
         await db_session.commit()
+        centro_treinamento_ids.invalidate(centro_treinamento_in.nome)
+        await response_cache.invalidate('centros_treinamento')
     except IntegrityError as exc:
         if isinstance(exc.orig, UniqueViolation):
             conflicting_nome = exc.params.get('nome')  # Ajuste para o nome do seu campo único
@@ -53,21 +95,50 @@ async def post(
         "/",
         summary="Consultar todos centros de treinamento0",
         status_code=status.HTTP_200_OK,
-        response_model=list[CentroTreinamentoOut],
+        response_model=Union[CursorPage[CentroTreinamentoOut], OffsetPage[CentroTreinamentoOut]],
 )
 async def query(
-    db_session: DatabaseDependency, 
-    page: int = 1, 
-    size: int = 10
-) -> Page[CentroTreinamentoOut]:
+    request: Request,
+    db_session: DatabaseDependency,
+    cursor: Optional[str] = None,
+    page: Optional[int] = Query(None, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    total: TotalMode = 'exact',
+    if_none_match: Optional[str] = Header(None),
+) -> Union[CursorPage[CentroTreinamentoOut], OffsetPage[CentroTreinamentoOut]]:
+    chave = cache_key(request)
+    content, geracao = await response_cache.get('centros_treinamento', chave)
+    if content is not None:
+        return etag_content_response(content, if_none_match)
+
+    # Lida do primário, não da réplica: o resultado fica no cache pelo TTL
+    # inteiro, e uma réplica atrasada gravaria de volta o que o POST acabou de
+    # invalidar. Com o cache quente a sessão nem chega a abrir conexão.
     centros_query = select(CentroTreinamentoModel)
-    centros = await db_session.execute(centros_query)
 
-    return paginate(
-        [CentroTreinamentoOut.model_validate(centro) for centro in centros.scalars().all()], 
-        page, 
-        size
-    )
+    if page is None:
+        centros = await paginate_cursor(
+            db_session,
+            centros_query,
+            CentroTreinamentoModel,
+            CentroTreinamentoOut,
+            cursor,
+            size
+        )
+    else:
+        centros = await paginate_offset(
+            db_session,
+            centros_query,
+            CentroTreinamentoModel,
+            CentroTreinamentoOut,
+            page,
+            size,
+            total
+        )
+
+    content = centros.model_dump_json().encode()
+    await response_cache.set('centros_treinamento', chave, content, geracao)
+    return etag_content_response(content, if_none_match)
 
 @router.get(
         "/{id}",
@@ -75,14 +146,21 @@ async def query(
         status_code=status.HTTP_200_OK,
         response_model=CentroTreinamentoOut,
 )
-async def query(id: UUID4, db_session: DatabaseDependency) -> list[CentroTreinamentoOut]:
-    centro_treinamento_out: CentroTreinamentoOut = (await db_session.execute(select(CentroTreinamentoModel).filter_by(id=id))).scalars().first()
+async def get(
+    id: UUID4,
+    if_none_match: Optional[str] = Header(None),
+) -> CentroTreinamentoOut:
+    resposta = await not_modified(CentroTreinamentoModel, id, if_none_match)
+    if resposta:
+        return resposta
 
-    if not centro_treinamento_out:
+    centro_treinamento = await centros_por_id.do(id, lambda: _carregar_centro_treinamento(id))
+
+    if not centro_treinamento:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f'Centro de trinamento não encontrado no id: {id}'
         )
 
-    return centro_treinamento_out
+    content, version = centro_treinamento
+    return json_content_response(content, headers={'ETag': row_etag(id, version)})
 
-add_pagination(router) 
\ No newline at end of file
@@ -1,14 +1,21 @@
-from sqlalchemy import Integer, String
+from typing import TYPE_CHECKING
+from sqlalchemy import Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship 
 from workoutapi.contrib.models import BaseModel
 
+if TYPE_CHECKING:
+    from workoutapi.atleta.models import AtletaModel
+
 
 class CentroTreinamentoModel(BaseModel):
     __tablename__ = "centros_treinamento"
+    __table_args__ = (
+        Index('ix_centros_treinamento_nome_trgm', 'nome', postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'}),
+    )
 
     pk_id: Mapped[int] = mapped_column (Integer, primary_key=True)
     nome: Mapped[str] = mapped_column (String(50), unique=True, nullable=False)
     endereco: Mapped[str] = mapped_column (String(60), nullable=False)
     proprietario: Mapped[str] = mapped_column (String(30), nullable=False)
-    atleta: Mapped["atletaModel"] = relationship(back_populates="centros_treinamento")
+    atleta: Mapped[list["AtletaModel"]] = relationship(back_populates="centro_treinamento")
     
\ No newline at end of file
@@ -1,14 +1,170 @@
-from typing import AsyncGenerator
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from workoutapi.configs.settings import settings
+from workoutapi.contrib.metrics import Counter, Gauge, Histogram
+from workoutapi.contrib.querystats import record_statement
+
+pool_size = Gauge('db_pool_size', 'Conexões mantidas abertas pelo pool', ['pool'])
+pool_checked_out = Gauge('db_pool_checked_out', 'Conexões emprestadas para sessões', ['pool'])
+pool_overflow = Gauge('db_pool_overflow', 'Conexões abertas além de pool_size', ['pool'])
+pool_wait_seconds = Histogram(
+    'db_pool_wait_seconds',
+    'Tempo esperando uma conexão livre no pool',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+pool_timeouts = Counter('db_pool_timeouts', 'Checkouts que estouraram pool_timeout', ['pool'])
+replica_fallbacks = Counter('db_replica_fallbacks', 'Leituras desviadas para o primário por falha na réplica', ['pool'])
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(pool=self.logging_name)
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - inicio, pool=self.logging_name)
+
+
+def _engine_options() -> dict:
+    options = dict(
+        echo=False,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options['connect_args'] = {
+            'server_settings': {'statement_timeout': str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        }
+    return options
+
+
+def _instrument(engine: AsyncEngine, name: str) -> None:
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_statement(name, statement, time.perf_counter() - conn.info['query_start'].pop())
+
+    @event.listens_for(engine.sync_engine, 'handle_error')
+    def _handle_error(context):
+        inicios = context.connection.info.get('query_start') if context.connection is not None else None
+        if inicios:
+            inicios.pop()
+
+
+def create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(url, pool_logging_name=name, **_engine_options())
+    _instrument(engine, name)
+
+    # O pool é recriado em engine.dispose(), então os gauges sempre leem o atual.
+    pool_size.set_function(lambda: engine.sync_engine.pool.size(), pool=name)
+    pool_checked_out.set_function(lambda: engine.sync_engine.pool.checkedout(), pool=name)
+    pool_overflow.set_function(lambda: max(engine.sync_engine.pool.overflow(), 0), pool=name)
+
+    return engine
+
+
+class ReplicaRouter:
+    def __init__(self, primary: AsyncEngine, replicas: list[AsyncEngine], selection: str, cooldown: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.selection = selection
+        self.cooldown = cooldown
+        self._ciclo = itertools.count()
+        self._indisponivel_ate: dict[AsyncEngine, float] = {}
+
+        for replica in replicas:
+            self._watch(replica)
+
+    def _watch(self, replica: AsyncEngine) -> None:
+        @event.listens_for(replica.sync_engine, 'handle_error')
+        def _handle_error(context):
+            if context.is_disconnect:
+                self.mark_unhealthy(replica)
+
+    def mark_unhealthy(self, replica: AsyncEngine) -> None:
+        self._indisponivel_ate[replica] = time.monotonic() + self.cooldown
+
+    def choose(self) -> AsyncEngine:
+        agora = time.monotonic()
+        disponiveis = [replica for replica in self.replicas if self._indisponivel_ate.get(replica, 0) <= agora]
+
+        if not disponiveis:
+            return self.primary
+        if self.selection == 'least_connections':
+            return min(disponiveis, key=lambda replica: replica.sync_engine.pool.checkedout())
+        return disponiveis[next(self._ciclo) % len(disponiveis)]
+
+
+engine = create_engine(settings.DB_URL, 'primary')
+replica_engines = [
+    create_engine(url, f'replica{numero}') for numero, url in enumerate(settings.DB_REPLICA_URLS, start=1)
+]
+replica_router = ReplicaRouter(engine, replica_engines, settings.DB_REPLICA_SELECTION, settings.DB_REPLICA_COOLDOWN)
 
-engine = create_async_engine(echo=False)
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
 async def get_session() -> AsyncGenerator:
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+class ReplicaSession(Session):
+    # Como no primário, a conexão com a réplica só é aberta no primeiro
+    # statement. Se ela não conectar, a sessão passa a usar o primário e a
+    # réplica sai da escolha até o fim do cooldown.
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        replica = self.info.get('replica')
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except (DBAPIError, OSError):
+            if replica is None or engine is not replica.sync_engine:
+                raise
+
+        replica_router.mark_unhealthy(replica)
+        replica_fallbacks.inc(pool=replica.sync_engine.pool.logging_name)
+        del self.info['replica']
+        self.bind = primary = replica_router.primary.sync_engine
+        return super()._connection_for_bind(primary, execution_options, **kw)
+
+
+replica_session = sessionmaker(
+    class_=AsyncSession, sync_session_class=ReplicaSession, expire_on_commit=False
+)
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    replica = replica_router.choose()
+    if replica is engine:
+        session = async_session()
+    else:
+        session = replica_session(bind=replica, info={'replica': replica})
+
+    async with session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator:
+    async with read_session() as session:
+        yield session
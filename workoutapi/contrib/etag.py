@@ -0,0 +1,63 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel
+from sqlalchemy.future import select
+
+from workoutapi.configs.database import read_session
+from workoutapi.contrib.responses import JSON_MEDIA_TYPE
+
+
+def row_etag(id, version: int) -> str:
+    return f'"{id}-{version}"'
+
+
+def body_etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    # If-None-Match usa comparação fraca: W/"x" casa com "x".
+    candidatos = {candidato.strip().removeprefix('W/') for candidato in if_none_match.split(',')}
+    return '*' in candidatos or etag in candidatos
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+async def not_modified(model, id, if_none_match: Optional[str]) -> Optional[Response]:
+    if not if_none_match:
+        return None
+
+    # Só a versão da linha: sem JOINs, sem carregar o modelo e sem serializar.
+    # A sessão é devolvida ao pool antes de a rota carregar a linha inteira,
+    # então cada requisição ocupa no máximo uma conexão por vez.
+    async with read_session() as db_session:
+        version = (await db_session.execute(
+            select(model.version).where(model.id == id))
+        ).scalar_one_or_none()
+
+    if version is not None:
+        etag = row_etag(id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+
+    return None
+
+
+def etag_json_response(model: BaseModel, if_none_match: Optional[str] = None) -> Response:
+    return etag_content_response(model.model_dump_json().encode(), if_none_match)
+
+
+def etag_content_response(content: bytes, if_none_match: Optional[str] = None) -> Response:
+    etag = body_etag(content)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers={'ETag': etag})
@@ -0,0 +1,88 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Coroutine
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.cache import TTLCache
+from workoutapi.contrib.metrics import Counter
+from workoutapi.contrib.singleflight import SingleFlight
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+idempotency_requests = Counter(
+    'idempotency_requests', 'POSTs com Idempotency-Key, por resultado (executed, replayed, conflict)', ['resultado']
+)
+
+
+@dataclass(frozen=True)
+class _Registro:
+    impressao: str
+    status_code: int
+    body: bytes
+    headers: dict[str, str]
+
+
+respostas = TTLCache(ttl=settings.IDEMPOTENCY_TTL, maxsize=settings.IDEMPOTENCY_MAXSIZE)
+_em_andamento = SingleFlight('idempotency')
+
+
+class IdempotentRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            chave = request.headers.get(IDEMPOTENCY_HEADER)
+            if request.method != 'POST' or not chave:
+                return await original_route_handler(request)
+
+            # A query string entra na impressão: o mesmo corpo com outro
+            # on_conflict é outra operação, não uma retentativa.
+            impressao = hashlib.sha256(request.url.query.encode() + b'\n' + await request.body()).hexdigest()
+            key = (request.url.path, chave)
+            executada = None
+
+            async def executar() -> _Registro:
+                nonlocal executada
+                registro = respostas.get(key)
+                if registro is not None:
+                    return registro
+
+                executada = await original_route_handler(request)
+                registro = _Registro(
+                    impressao=impressao,
+                    status_code=executada.status_code,
+                    body=executada.body,
+                    headers={nome: valor for nome, valor in executada.headers.items() if nome != 'content-length'},
+                )
+                # Erros do servidor não são guardados: a próxima tentativa executa de novo.
+                if registro.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    respostas.set(key, registro)
+                return registro
+
+            # Retentativas que chegam enquanto a primeira ainda executa
+            # aguardam o mesmo resultado em vez de disputar o INSERT.
+            registro = await _em_andamento.do(key, executar)
+
+            if registro.impressao != impressao:
+                idempotency_requests.inc(resultado='conflict')
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f'{IDEMPOTENCY_HEADER} {chave} já foi usada com outro corpo ou query string'
+                )
+
+            if executada is not None:
+                idempotency_requests.inc(resultado='executed')
+                return executada
+
+            idempotency_requests.inc(resultado='replayed')
+            return Response(
+                content=registro.body,
+                status_code=registro.status_code,
+                headers={**registro.headers, REPLAYED_HEADER: 'true'},
+            )
+
+        return route_handler
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from workoutapi.categorias.models import CategoriaModel
+from workoutapi.centro_treinamento.models import CentroTreinamentoModel
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.cache import TTLCache
+
+categoria_ids = TTLCache(ttl=settings.LOOKUP_CACHE_TTL)
+centro_treinamento_ids = TTLCache(ttl=settings.LOOKUP_CACHE_TTL)
+
+
+async def _lookup_pk_id(db_session: AsyncSession, cache: TTLCache, model, nome: str) -> Optional[int]:
+    pk_id = cache.get(nome)
+    if pk_id is None:
+        pk_id = (await db_session.execute(
+            select(model.pk_id).filter_by(nome=nome))
+        ).scalars().first()
+
+        if pk_id is not None:
+            cache.set(nome, pk_id)
+
+    return pk_id
+
+
+async def get_categoria_id(db_session: AsyncSession, nome: str) -> Optional[int]:
+    return await _lookup_pk_id(db_session, categoria_ids, CategoriaModel, nome)
+
+
+async def get_centro_treinamento_id(db_session: AsyncSession, nome: str) -> Optional[int]:
+    return await _lookup_pk_id(db_session, centro_treinamento_ids, CentroTreinamentoModel, nome)
@@ -0,0 +1,148 @@
+import bisect
+import math
+from typing import Callable, Iterable, Optional
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{nome}="{_escape(str(valor))}"' for nome, valor in labels.items()) + '}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list['_Metric'] = []
+
+    def register(self, metric: '_Metric') -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        linhas = []
+        for metric in self._metrics:
+            linhas.append(f'# HELP {metric.name} {metric.documentation}')
+            linhas.append(f'# TYPE {metric.name} {metric.type}')
+            for nome, labels, valor in metric.samples():
+                linhas.append(f'{nome}{_format_labels(labels)} {_format_value(valor)}')
+        return '\n'.join(linhas) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = 'untyped'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: Optional[Registry] = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} espera as labels {self.labelnames}, recebeu {tuple(labels)}')
+        return tuple(str(labels[nome]) for nome in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key, valor in self._values.items():
+            yield f'{self.name}_total', self._labels(key), valor
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        self._functions[self._key(labels)] = function
+
+    def samples(self):
+        for key, valor in self._values.items():
+            yield self.name, self._labels(key), valor
+        for key, function in self._functions.items():
+            yield self.name, self._labels(key), function()
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def samples(self):
+        for key, counts in self._counts.items():
+            labels = self._labels(key)
+            acumulado = 0
+            for limite, count in zip(self.buckets + (math.inf,), counts):
+                acumulado += count
+                yield f'{self.name}_bucket', {**labels, 'le': _format_value(limite)}, acumulado
+            yield f'{self.name}_sum', labels, self._sums[key]
+            yield f'{self.name}_count', labels, acumulado
@@ -0,0 +1,93 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from workoutapi.contrib.metrics import Counter, Gauge, Histogram
+from workoutapi.contrib.querystats import QueryStats, query_stats
+
+http_requests_in_flight = Gauge('http_requests_in_flight', 'Requisições HTTP em andamento', ['method'])
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds', 'Duração das requisições HTTP por rota', ['method', 'route']
+)
+http_responses = Counter('http_responses', 'Respostas HTTP por rota e status', ['method', 'route', 'status'])
+
+
+class MetricsMiddleware:
+    # ASGI puro: sem BaseHTTPMiddleware não há task extra nem cópia do corpo
+    # da resposta, e StreamingResponse continua fazendo streaming.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: dict[object, str] = {}
+
+    def _template(self, scope: Scope) -> str:
+        # O template (/atletas/{id}) mantém a cardinalidade das labels
+        # limitada. O FastAPI grava a APIRoute em scope['route']; rotas
+        # Starlette simples, como /openapi.json e /docs, só deixam o endpoint.
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return 'unmatched'
+
+        template = self._templates.get(endpoint)
+        if template is None:
+            template = next(
+                (route.path for route in scope['app'].routes if getattr(route, 'endpoint', None) is endpoint),
+                getattr(endpoint, '__name__', 'unknown'),
+            )
+            self._templates[endpoint] = template
+        return template
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duracao = time.perf_counter() - inicio
+            http_requests_in_flight.dec(method=method)
+
+            template = self._template(scope)
+            http_request_duration_seconds.observe(duracao, method=method, route=template)
+            http_responses.inc(method=method, route=template, status=str(status_code))
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', f'db;dur={stats.duration * 1000:.3f};desc="{stats.statements} statements"')
+                headers.append('X-DB-Statements', str(stats.statements))
+            await send(message)
+
+        token = query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
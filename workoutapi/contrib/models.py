@@ -1,8 +1,9 @@
-from sqlalchemy import uuid4
-from sqlalchemy import UUID
+from uuid import uuid4
+from sqlalchemy import UUID, Integer
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 
 class BaseModel(DeclarativeBase):
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), default=uuid4, nullable=False)
\ No newline at end of file
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), default=uuid4, nullable=False, unique=True, index=True)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default='1', nullable=False)
@@ -0,0 +1,130 @@
+import base64
+import binascii
+from typing import Annotated, Generic, Literal, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from workoutapi.contrib.responses import list_adapter
+
+T = TypeVar('T')
+
+TotalMode = Literal['exact', 'approximate']
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    size: int
+    next_cursor: Optional[str] = None
+
+
+class OffsetPage(BaseModel, Generic[T]):
+    items: list[T]
+    page: int
+    size: int
+    total: int
+    approximate_total: Annotated[bool, Field(
+        description='Se total é a estimativa do planner. Com filtros o total é sempre exato, mesmo com total=approximate'
+    )]
+
+
+def encode_cursor(pk_id: int) -> str:
+    return base64.urlsafe_b64encode(str(pk_id).encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Cursor inválido: {cursor}'
+        )
+
+
+async def paginate_cursor(
+    db_session: AsyncSession,
+    query: Select,
+    model,
+    schema: type[T],
+    cursor: Optional[str],
+    size: int,
+) -> CursorPage[T]:
+    query = query.order_by(model.pk_id).limit(size + 1)
+    if cursor is not None:
+        query = query.where(model.pk_id > decode_cursor(cursor))
+
+    rows = (await db_session.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1].pk_id)
+
+    return CursorPage[schema](
+        items=list_adapter(schema).validate_python(rows, from_attributes=True),
+        size=size,
+        next_cursor=next_cursor,
+    )
+
+
+def _total_column(model, total: TotalMode):
+    if total == 'exact':
+        return func.count().over().label('total')
+
+    # reltuples é a estimativa do planner, atualizada por VACUUM/ANALYZE;
+    # em tabelas que nunca foram analisadas ela vale -1.
+    return literal_column(
+        f"(SELECT reltuples::bigint FROM pg_class WHERE oid = '{model.__tablename__}'::regclass)"
+    ).label('total')
+
+
+async def paginate_offset(
+    db_session: AsyncSession,
+    query: Select,
+    model,
+    schema: type[T],
+    page: int,
+    size: int,
+    total: TotalMode = 'exact',
+) -> OffsetPage[T]:
+    if total == 'approximate' and query.whereclause is not None:
+        # reltuples estima a tabela inteira e ignora o WHERE: com filtros só
+        # o count exato corresponde às linhas paginadas.
+        total = 'exact'
+
+    offset = (page - 1) * size
+    page_query = (
+        query.add_columns(_total_column(model, total))
+        .order_by(model.pk_id)
+        .offset(offset)
+        .limit(size)
+    )
+    rows = (await db_session.execute(page_query)).all()
+
+    if rows:
+        count = rows[0].total
+    elif offset == 0:
+        count = 0
+    elif total == 'exact':
+        # Página além do fim: a window function não devolve linhas, então
+        # o total só pode vir de um count(*) separado.
+        count = (await db_session.execute(
+            select(func.count()).select_from(query.subquery())
+        )).scalar_one()
+    else:
+        count = (await db_session.execute(select(_total_column(model, total)))).scalar_one()
+
+    if total == 'approximate':
+        count = max(count, offset + len(rows))
+
+    return OffsetPage[schema](
+        items=list_adapter(schema).validate_python([row[0] for row in rows], from_attributes=True),
+        page=page,
+        size=size,
+        total=count,
+        approximate_total=total == 'approximate',
+    )
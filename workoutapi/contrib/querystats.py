@@ -0,0 +1,52 @@
+import logging
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.metrics import Histogram
+
+logger = logging.getLogger('workoutapi.sql')
+
+db_statement_duration_seconds = Histogram(
+    'db_statement_duration_seconds',
+    'Duração de cada statement no banco',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+_ESPACOS = re.compile(r'\s+')
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r'(?<![\w$])\d+(?:\.\d+)?')
+_LISTAS_PARAMETROS = re.compile(r'\$\d+(?:\s*,\s*\$\d+)+')
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    duration: float = 0.0
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    # Literais viram ? e listas de parâmetros do IN viram uma só, para que o
+    # mesmo statement com valores diferentes apareça igual no log.
+    statement = _STRINGS.sub('?', statement)
+    statement = _NUMEROS.sub('?', statement)
+    statement = _LISTAS_PARAMETROS.sub('$n, ...', statement)
+    return _ESPACOS.sub(' ', statement).strip()
+
+
+def record_statement(pool: str, statement: str, duration: float) -> None:
+    db_statement_duration_seconds.observe(duration, pool=pool)
+
+    stats = query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.duration += duration
+
+    if settings.DB_SLOW_QUERY_MS and duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning('Consulta lenta em %s (%.1f ms): %s', pool, duration * 1000, normalize_sql(statement))
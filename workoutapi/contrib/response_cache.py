@@ -0,0 +1,112 @@
+from typing import Optional, Protocol
+
+from fastapi import Request
+
+from workoutapi.configs.settings import settings
+from workoutapi.contrib.cache import TTLCache
+from workoutapi.contrib.metrics import Counter
+
+response_cache_lookups = Counter(
+    'response_cache_lookups', 'Consultas ao cache de respostas, por namespace e resultado', ['namespace', 'resultado']
+)
+
+
+# Cada namespace tem uma geração, incrementada a cada invalidate. get devolve
+# a geração junto com a resposta e set só grava se ela ainda for a atual: um
+# GET que consultou o banco antes do POST não devolve ao cache a página antiga.
+class ResponseCacheBackend(Protocol):
+    async def get(self, namespace: str, key: str) -> tuple[Optional[bytes], int]: ...
+
+    async def set(self, namespace: str, key: str, value: bytes, geracao: int) -> None: ...
+
+    async def invalidate(self, namespace: str) -> None: ...
+
+
+class MemoryBackend:
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._namespaces: dict[str, TTLCache] = {}
+        self._geracoes: dict[str, int] = {}
+
+    async def get(self, namespace: str, key: str) -> tuple[Optional[bytes], int]:
+        cache = self._namespaces.get(namespace)
+        return None if cache is None else cache.get(key), self._geracoes.get(namespace, 0)
+
+    async def set(self, namespace: str, key: str, value: bytes, geracao: int) -> None:
+        if geracao != self._geracoes.get(namespace, 0):
+            return
+
+        cache = self._namespaces.get(namespace)
+        if cache is None:
+            cache = self._namespaces[namespace] = TTLCache(ttl=self.ttl, maxsize=self.maxsize)
+        cache.set(key, value)
+
+    async def invalidate(self, namespace: str) -> None:
+        self._geracoes[namespace] = self._geracoes.get(namespace, 0) + 1
+        self._namespaces.pop(namespace, None)
+
+
+class RedisBackend:
+    # Um hash por namespace e geração; invalidar é um INCR da geração. Se o
+    # INCR cair entre a conferência de set e o HSET, a resposta vai para o
+    # hash da geração antiga, que ninguém mais lê. O hash expira inteiro, ttl
+    # segundos depois da primeira resposta guardada nele.
+    def __init__(self, client, ttl: float, prefix: str = 'workoutapi:respostas:'):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    async def _geracao(self, namespace: str) -> int:
+        return int(await self.client.get(f'{self.prefix}{namespace}:geracao') or 0)
+
+    async def get(self, namespace: str, key: str) -> tuple[Optional[bytes], int]:
+        geracao = await self._geracao(namespace)
+        return await self.client.hget(f'{self.prefix}{namespace}:{geracao}', key), geracao
+
+    async def set(self, namespace: str, key: str, value: bytes, geracao: int) -> None:
+        if geracao != await self._geracao(namespace):
+            return
+
+        name = f'{self.prefix}{namespace}:{geracao}'
+        await self.client.hset(name, key, value)
+        await self.client.expire(name, self.ttl, nx=True)
+
+    async def invalidate(self, namespace: str) -> None:
+        geracao = await self.client.incr(f'{self.prefix}{namespace}:geracao')
+        await self.client.delete(f'{self.prefix}{namespace}:{geracao - 1}')
+
+
+class ResponseCache:
+    def __init__(self, backend: ResponseCacheBackend):
+        self.backend = backend
+
+    async def get(self, namespace: str, key: str) -> tuple[Optional[bytes], int]:
+        value, geracao = await self.backend.get(namespace, key)
+        response_cache_lookups.inc(namespace=namespace, resultado='miss' if value is None else 'hit')
+        return value, geracao
+
+    async def set(self, namespace: str, key: str, value: bytes, geracao: int) -> None:
+        await self.backend.set(namespace, key, value, geracao)
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.backend.invalidate(namespace)
+
+
+def cache_key(request: Request) -> str:
+    return request.url.path + '?' + '&'.join(f'{nome}={valor}' for nome, valor in sorted(request.query_params.multi_items()))
+
+
+def _backend() -> ResponseCacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == 'redis':
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError('RESPONSE_CACHE_BACKEND=redis requer o pacote redis instalado')
+
+        return RedisBackend(redis.from_url(settings.REDIS_URL), settings.RESPONSE_CACHE_TTL)
+
+    return MemoryBackend(settings.RESPONSE_CACHE_TTL, settings.RESPONSE_CACHE_MAXSIZE)
+
+
+response_cache = ResponseCache(_backend())
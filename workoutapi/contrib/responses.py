@@ -0,0 +1,36 @@
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+JSON_MEDIA_TYPE = 'application/json'
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def json_response(
+    model: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    # model_dump_json serializa direto no pydantic-core, sem passar pelo
+    # jsonable_encoder nem pela revalidação do response_model do FastAPI.
+    return Response(
+        content=model.model_dump_json(), status_code=status_code, media_type=JSON_MEDIA_TYPE, headers=headers
+    )
+
+
+def json_content_response(
+    content: bytes,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    return Response(content=content, status_code=status_code, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def json_list_response(schema: type[BaseModel], items: list, status_code: int = status.HTTP_200_OK) -> Response:
+    return Response(content=list_adapter(schema).dump_json(items), status_code=status_code, media_type=JSON_MEDIA_TYPE)
@@ -1,13 +1,13 @@
 from typing import Annotated
 from pydantic import UUID4, BaseModel, Field
-from datetime import dateTime
+from datetime import datetime
 
 class BaseSchema(BaseModel):
-    class config:
+    class Config:
         extra = "forbid"
         from_attributes = True
 
-        class OutMixin(BaseModel):
-            id: Annotated[UUID4, Field(description="Identificador")]
-            created_at: Annotated[dateTime, Field(descripition="Data de criação")]
-        
\ No newline at end of file
+
+class OutMixin(BaseModel):
+    id: Annotated[UUID4, Field(description="Identificador")]
+    created_at: Annotated[datetime, Field(description="Data de criação")]
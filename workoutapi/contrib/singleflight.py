@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from workoutapi.contrib.metrics import Counter
+
+T = TypeVar('T')
+
+singleflight_calls = Counter(
+    'singleflight_calls', 'Leituras por grupo: executadas (leader) ou que aguardaram outra (coalesced)', ['grupo', 'papel']
+)
+
+
+class SingleFlight:
+    def __init__(self, grupo: str):
+        self.grupo = grupo
+        self._em_andamento: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._em_andamento.get(key)
+
+        if task is None:
+            singleflight_calls.inc(grupo=self.grupo, papel='leader')
+            task = self._em_andamento[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._em_andamento.pop(key, None))
+        else:
+            singleflight_calls.inc(grupo=self.grupo, papel='coalesced')
+
+        # shield: se quem disparou a leitura for cancelado (cliente
+        # desconectou), ela continua para os demais que estão aguardando.
+        return await asyncio.shield(task)
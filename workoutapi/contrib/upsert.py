@@ -0,0 +1,53 @@
+from typing import Any, Literal
+from uuid import uuid4
+
+from sqlalchemy import RowMapping, exists, false, literal_column, true, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+OnConflict = Literal['update', 'ignore']
+
+
+async def upsert_by_nome(
+    db_session: AsyncSession,
+    model,
+    values: dict[str, Any],
+    on_conflict: OnConflict,
+) -> tuple[RowMapping, bool]:
+    tabela = model.__table__
+    stmt = insert(tabela).values(id=uuid4(), **values)
+    atualizar = [coluna for coluna in values if coluna != 'nome']
+
+    if on_conflict == 'update' and atualizar:
+        # O WHERE evita reescrever a linha (e trocar a version/ETag) quando
+        # o ERP reenvia os mesmos dados.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabela.c.nome],
+            set_={**{coluna: stmt.excluded[coluna] for coluna in atualizar}, 'version': tabela.c.version + 1},
+            where=tuple_(*(tabela.c[coluna] for coluna in atualizar)).is_distinct_from(
+                tuple_(*(stmt.excluded[coluna] for coluna in atualizar))
+            ),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[tabela.c.nome])
+
+    # xmax = 0 só vale para a versão da linha criada por este INSERT. Quando o
+    # ON CONFLICT não devolve nada, o UNION traz a linha existente no mesmo
+    # statement.
+    gravado = stmt.returning(
+        *tabela.c, literal_column('xmax = 0').label('inserido'), true().label('alterado')
+    ).cte('gravado')
+    existente = select(*tabela.c, false().label('inserido'), false().label('alterado')).where(
+        tabela.c.nome == values['nome'], ~exists(select(gravado.c.id))
+    )
+
+    row = (await db_session.execute(select(gravado).union_all(existente))).mappings().first()
+    if row is None:
+        # A linha conflitante foi gravada por outra transação depois do
+        # snapshot deste statement; um novo SELECT já a enxerga.
+        row = (await db_session.execute(
+            select(*tabela.c, false().label('inserido'), false().label('alterado')).where(tabela.c.nome == values['nome'])
+        )).mappings().one()
+
+    return row, row['alterado']
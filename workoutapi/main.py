@@ -1,8 +1,18 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from workoutapi.contrib.metrics import CONTENT_TYPE, REGISTRY
+from workoutapi.contrib.middleware import MetricsMiddleware, QueryStatsMiddleware
 from workoutapi.routers import api_router
 
-app = FastAPI(title='WorkoutApi')
+app = FastAPI(title='WorkoutApi', default_response_class=ORJSONResponse)
 app.include_router(api_router)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
 
 if __name__ == 'main':
     import uvicorn